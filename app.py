@@ -29,6 +29,15 @@ ALLOWED_PLATFORMS = [
     'instagram.com', 'www.instagram.com'  # Instagram (bonus)
 ]
 
+# Dot-prefixed domain suffixes per platform, matched with one str.endswith(tuple) each
+PLATFORM_SUFFIXES = (
+    ('tiktok', ('.tiktok.com',)),
+    ('youtube', ('.youtube.com', '.youtu.be')),
+    ('facebook', ('.facebook.com', '.fb.com')),
+    ('douyin', ('.douyin.com',)),
+    ('instagram', ('.instagram.com',))
+)
+
 # YouTube API Configuration
 YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY', '')
 YOUTUBE_API_SERVICE_NAME = 'youtube'
@@ -71,20 +80,12 @@ class VideoFrameExtractor:
     def get_platform_from_url(self, url):
         """Detect platform from URL"""
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            if 'tiktok.com' in domain or 'vm.tiktok.com' in domain:
-                return 'tiktok'
-            elif 'youtube.com' in domain or 'youtu.be' in domain:
-                return 'youtube'
-            elif 'facebook.com' in domain or 'fb.com' in domain:
-                return 'facebook'
-            elif 'douyin.com' in domain:
-                return 'douyin'
-            elif 'instagram.com' in domain:
-                return 'instagram'
-            else:
-                return 'unknown'
+            # Leading dot so the bare domain and its subdomains both match the suffixes
+            domain = '.' + (urlparse(url).hostname or '')
+            for platform, suffixes in PLATFORM_SUFFIXES:
+                if domain.endswith(suffixes):
+                    return platform
+            return 'unknown'
         except Exception:
             return 'unknown'
     
@@ -1,25 +1,209 @@
 """
 Enhanced Flask application with improved architecture, security, and monitoring
 """
-from flask import Flask, request, render_template, jsonify, send_from_directory, redirect, url_for
+from flask import Flask, Response, request, render_template, jsonify, send_from_directory, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
+from cachetools import TTLCache
+from flask_compress import Compress
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.security import safe_join
 import time
 import os
-from datetime import datetime
+import re
+import contextvars
+import hashlib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote
+import orjson
+import psutil
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
+from moviepy.editor import TextClip, CompositeVideoClip
 
 from config import get_config
-from logger import app_logger, api_logger, LogContext
+from logger import app_logger, api_logger, LogContext, log_context
 from validators import validator
 
 # Load environment variables
 load_dotenv()
-from video_processor import extractor
-from database import get_analytics, get_recent_requests
-from youtube_uploader import youtube_uploader
+from video_processor import get_extractor, VideoProcessingError, SectionOutOfRangeError
+from database import db_manager, get_analytics, get_recent_requests
+from youtube_uploader import get_uploader
+
+# Resolved once at import, after .env has been loaded
+_CFG = get_config()
+
+# ISO 8601 duration as returned by the YouTube Data API (e.g. PT4M13S, PT1H2M30S)
+_ISO_DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+
+# Extracted frames are always saved as frame_<seconds>s_<id>.jpg
+_SAFE_FRAME_FILENAME = re.compile(r'[A-Za-z0-9_-]{1,128}\.jpg')
+
+# Anything but letters, digits, space, '-' and '_' is dropped from short-video titles
+_UNSAFE_TITLE_CHARS_RE = re.compile(r'[^\w -]+')
+
+# Shared read-only default for missing nested API objects (never mutated)
+_EMPTY = {}
+
+# Static API payloads, serialized once at import instead of on every request
+PLATFORM_STATUS = {
+    'youtube': {'name': '📺 YouTube', 'status': 'active', 'note': 'Fully supported'},
+    'tiktok': {'name': '🎵 TikTok', 'status': 'active', 'note': 'Enhanced format support'},
+    'facebook': {'name': '📘 Facebook', 'status': 'active', 'note': 'Public videos supported'},
+    'douyin': {'name': '🎨 Douyin', 'status': 'active', 'note': 'Chinese TikTok version'},
+    'instagram': {'name': '📸 Instagram', 'status': 'active', 'note': 'Posts and Reels supported'}
+}
+
+# Common YouTube categories
+VIDEO_CATEGORIES = [
+    {'id': '1', 'name': 'Film & Animation'},
+    {'id': '2', 'name': 'Autos & Vehicles'},
+    {'id': '10', 'name': 'Music'},
+    {'id': '15', 'name': 'Pets & Animals'},
+    {'id': '17', 'name': 'Sports'},
+    {'id': '19', 'name': 'Travel & Events'},
+    {'id': '20', 'name': 'Gaming'},
+    {'id': '22', 'name': 'People & Blogs'},
+    {'id': '23', 'name': 'Comedy'},
+    {'id': '24', 'name': 'Entertainment'},
+    {'id': '25', 'name': 'News & Politics'},
+    {'id': '26', 'name': 'Howto & Style'},
+    {'id': '27', 'name': 'Education'},
+    {'id': '28', 'name': 'Science & Technology'}
+]
+
+_PLATFORM_STATUS_JSON = orjson.dumps(PLATFORM_STATUS)
+_VIDEO_CATEGORIES_JSON = orjson.dumps({
+    'categories': VIDEO_CATEGORIES,
+    'total': len(VIDEO_CATEGORIES)
+})
+_VIDEO_CATEGORIES_ETAG = hashlib.sha256(_VIDEO_CATEGORIES_JSON).hexdigest()[:16]
+
+# YouTube category ID -> name, used per trending item
+YOUTUBE_CATEGORY_NAMES = {
+    **{category['id']: category['name'] for category in VIDEO_CATEGORIES},
+    '29': 'Nonprofits & Activism'
+}
+
+# Frequent fixed validation errors
+_ERR_SEARCH_QUERY_REQUIRED = orjson.dumps({'error': 'Search query is required'})
+_ERR_SEARCH_PLATFORM_UNSUPPORTED = orjson.dumps({'error': 'Only YouTube search is currently supported'})
+
+# Only the timestamp of the health payload changes, so splice it between fixed bytes
+_HEALTH_PREFIX = b'{"status": "healthy", "version": "2.0.0", "timestamp": "'
+_HEALTH_SUFFIX = b'"}'
+
+# System metrics are sampled at most once per interval so polling dashboards don't hammer /proc
+SYSTEM_INFO_TTL_SECONDS = 1.0
+_BOOT_TIME = psutil.boot_time()
+_system_info_cache = (None, 0.0)  # (system_info, expires_at)
+
+def get_system_info() -> dict:
+    """Get a CPU/memory/disk snapshot, reusing the last one within the TTL"""
+    global _system_info_cache
+    
+    system_info, expires_at = _system_info_cache
+    now = time.monotonic()
+    if system_info is not None and now < expires_at:
+        return system_info
+    
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    system_info = {
+        'cpu_percent': psutil.cpu_percent(interval=None),
+        'memory_percent': memory.percent,
+        'disk_usage': disk.percent,
+        'uptime': time.time() - _BOOT_TIME
+    }
+    _system_info_cache = (system_info, now + SYSTEM_INFO_TTL_SECONDS)
+    return system_info
+
+# Search responses keyed by (platform, query, max_results); bodies are stored serialized
+SEARCH_CACHE_TTL_SECONDS = 24 * 60 * 60
+_search_cache = TTLCache(maxsize=4096, ttl=SEARCH_CACHE_TTL_SECONDS)
+_search_cache_lock = threading.Lock()
+_search_cache_stats = {'hits': 0, 'misses': 0}
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson so every jsonify() skips the pure-Python encoder"""
+    
+    # Datetimes go through Flask's default hook so they keep the HTTP-date format
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.options).decode('utf-8')
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.options),
+            mimetype=self.mimetype
+        )
+
+def json_bytes_response(body: bytes, status: int = 200) -> Response:
+    """Wrap pre-serialized JSON bytes in a response without re-encoding"""
+    return Response(body, status=status, mimetype='application/json')
+
+def create_http_session() -> requests.Session:
+    """Create a pooled keep-alive session for outbound API calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET'])
+        )
+    )
+    session.mount('https://', adapter)
+    return session
+
+# Shared across requests so YouTube Data API calls skip repeated TLS handshakes
+http_session = create_http_session()
+
+# Platform lookup is a pure function of the URL string (validate_url caches its own results)
+@lru_cache(maxsize=1024)
+def cached_platform_from_url(url: str) -> str:
+    """Memoized validator.get_platform_from_url"""
+    return validator.get_platform_from_url(url)
+
+# Human-readable names for required JSON body fields
+_FIELD_LABELS = {'url': 'URL'}
+
+def parse_json_body(*required: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Parse the request JSON body and check required string fields in one pass
+    
+    Returns:
+        (data, error_message)
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return None, 'Request body must be a JSON object'
+    
+    for field in required:
+        value = data.get(field)
+        label = _FIELD_LABELS.get(field, field)
+        if value is None or value == '':
+            return None, f'{label} is required'
+        if not isinstance(value, str):
+            return None, f'{label} must be a string'
+    
+    return data, None
 
 def get_youtube_trending(category: str = '0', region: str = 'US', max_results: int = 20) -> list:
     """
@@ -49,7 +233,7 @@ def get_youtube_trending(category: str = '0', region: str = 'US', max_results: i
             params['videoCategoryId'] = category
         
         # Make API request
-        response = requests.get(url, params=params, timeout=10)
+        response = http_session.get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -60,32 +244,42 @@ def get_youtube_trending(category: str = '0', region: str = 'US', max_results: i
         
         # Transform API response to our format
         videos = []
+        now = datetime.now(timezone.utc)  # Shared reference time for the whole batch
         for item in data['items']:
             try:
-                snippet = item.get('snippet', {})
-                statistics = item.get('statistics', {})
-                content_details = item.get('contentDetails', {})
+                # Bind the dict getters once; each field below is a plain local call
+                snippet_get = (item.get('snippet') or _EMPTY).get
+                statistics_get = (item.get('statistics') or _EMPTY).get
+                content_details_get = (item.get('contentDetails') or _EMPTY).get
+                video_id = item['id']
                 
                 # Parse duration (ISO 8601 format like PT4M13S)
-                duration = parse_youtube_duration(content_details.get('duration', 'PT0S'))
+                duration = parse_youtube_duration(content_details_get('duration', 'PT0S'))
                 
                 # Format view count
-                view_count = int(statistics.get('viewCount', 0))
+                view_count = int(statistics_get('viewCount', 0))
                 
                 # Calculate time ago from published date
-                published_at = snippet.get('publishedAt', '')
-                time_ago = calculate_time_ago(published_at)
+                time_ago = calculate_time_ago(snippet_get('publishedAt', ''), now)
                 
                 # Get category name
-                category_name = get_youtube_category_name(snippet.get('categoryId', '1'))
+                category_name = get_youtube_category_name(snippet_get('categoryId', '1'))
+                
+                description = snippet_get('description') or ''
+                if len(description) > 200:
+                    description = description[:200] + '...'
+                
+                thumbnail = snippet_get('thumbnails', _EMPTY).get('medium', _EMPTY).get('url')
+                if not thumbnail:
+                    thumbnail = f'https://img.youtube.com/vi/{video_id}/mqdefault.jpg'
                 
                 video = {
-                    'id': item['id'],
-                    'title': snippet.get('title', 'Untitled'),
-                    'description': (snippet.get('description', '')[:200] + '...') if len(snippet.get('description', '')) > 200 else snippet.get('description', ''),
-                    'thumbnail': snippet.get('thumbnails', {}).get('medium', {}).get('url', f'https://img.youtube.com/vi/{item["id"]}/mqdefault.jpg'),
-                    'url': f"https://www.youtube.com/watch?v={item['id']}",
-                    'channel': snippet.get('channelTitle', 'Unknown Channel'),
+                    'id': video_id,
+                    'title': snippet_get('title', 'Untitled'),
+                    'description': description,
+                    'thumbnail': thumbnail,
+                    'url': f"https://www.youtube.com/watch?v={video_id}",
+                    'channel': snippet_get('channelTitle', 'Unknown Channel'),
                     'views': str(view_count),
                     'duration': duration,
                     'published': time_ago,
@@ -135,45 +329,28 @@ def parse_youtube_duration(duration_str: str) -> str:
     Parse YouTube API duration format (ISO 8601) to readable format
     Example: PT4M13S -> 4:13, PT1H2M30S -> 1:02:30
     """
-    try:
-        # Remove PT prefix
-        duration_str = duration_str.replace('PT', '')
-        
-        hours = 0
-        minutes = 0
-        seconds = 0
-        
-        # Extract hours
-        if 'H' in duration_str:
-            hours = int(duration_str.split('H')[0])
-            duration_str = duration_str.split('H')[1]
-        
-        # Extract minutes
-        if 'M' in duration_str:
-            minutes = int(duration_str.split('M')[0])
-            duration_str = duration_str.split('M')[1]
-        
-        # Extract seconds
-        if 'S' in duration_str:
-            seconds = int(duration_str.split('S')[0])
-        
-        # Format duration
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{seconds:02d}"
-        else:
-            return f"{minutes}:{seconds:02d}"
-            
-    except Exception:
+    match = _ISO_DURATION_RE.fullmatch(duration_str or '')
+    if not match:
         return "0:00"
+    
+    hours, minutes, seconds = (int(part) if part else 0 for part in match.groups())
+    
+    # Format duration
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
 
-def calculate_time_ago(published_at: str) -> str:
+def calculate_time_ago(published_at: str, now: datetime = None) -> str:
     """
     Calculate human-readable time ago from ISO datetime string
+    
+    Pass ``now`` to reuse one reference time across a batch of items.
     """
     try:
         # Parse the datetime (YouTube uses ISO format like 2025-01-15T10:30:00Z)
         published_dt = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-        now = datetime.now(published_dt.tzinfo)
+        if now is None:
+            now = datetime.now(published_dt.tzinfo)
         
         diff = now - published_dt
         
@@ -201,28 +378,153 @@ def get_youtube_category_name(category_id: str) -> str:
     """
     Map YouTube category ID to category name
     """
-    category_map = {
-        '1': 'Film & Animation',
-        '2': 'Autos & Vehicles', 
-        '10': 'Music',
-        '15': 'Pets & Animals',
-        '17': 'Sports',
-        '19': 'Travel & Events',
-        '20': 'Gaming',
-        '22': 'People & Blogs',
-        '23': 'Comedy',
-        '24': 'Entertainment',
-        '25': 'News & Politics',
-        '26': 'Howto & Style',
-        '27': 'Education',
-        '28': 'Science & Technology',
-        '29': 'Nonprofits & Activism'
-    }
-    return category_map.get(category_id, 'Unknown')
+    return YOUTUBE_CATEGORY_NAMES.get(category_id, 'Unknown')
+
+# x264 target bitrate per short-video quality setting
+SHORT_BITRATES = {'low': '1000k', 'medium': '2000k', 'high': '5000k'}
+
+def _encode(short_clip, output_path, bitrate: str) -> None:
+    """
+    Encode a rendered short with x264
+
+    veryfast skips most of x264's rate-distortion analysis, -threads 0 uses every
+    core, and +faststart puts the moov atom up front so playback starts at once.
+    """
+    short_clip.write_videofile(
+        str(output_path), codec='libx264', bitrate=bitrate,
+        preset='veryfast', ffmpeg_params=['-threads', '0', '-movflags', '+faststart', '-pix_fmt', 'yuv420p'],
+        audio_codec='aac', verbose=False, logger=None)
+
+def build_short_video(url: str, start_time: float, duration: float, options: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """
+    Download a video and cut a short from it
+
+    Returns:
+        Tuple of (response payload, HTTP status code)
+    """
+    extractor = get_extractor()
+    with LogContext(api_logger, "Short video creation"):
+        # Fetch only the requested span; the file starts at start_time
+        try:
+            video_path, video_title, metadata = extractor.download_video(url, section=(start_time, start_time + duration))
+        except SectionOutOfRangeError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            app_logger.error(f"Failed to download video: {str(e)}")
+            return {'error': 'Failed to download video'}, 500
+
+        if not video_path:
+            return {'error': 'Failed to download video'}, 500
+
+        # Generate unique filename
+        unique_id = str(uuid.uuid4())[:8]
+        safe_title = _UNSAFE_TITLE_CHARS_RE.sub('', (video_title or "short")[:50]).strip()
+        output_name = f"{safe_title}_{unique_id}_short"
+
+        # Create short video using moviepy
+        try:
+            output_path = _CFG.SHORTS_FOLDER / f"{output_name}.mp4"
+
+            # Probe the section length from the container header; no decoder is started
+            section_duration = extractor.probe_duration(video_path)
+            if not section_duration:
+                raise VideoProcessingError("Could not read video duration")
+
+            # The section is shorter when it runs past the end of the source
+            duration = min(duration, section_duration)
+
+            text_overlay = options.get('text_overlay')
+            has_text = bool(text_overlay and text_overlay.get('text'))
+            bitrate = SHORT_BITRATES.get(options.get('quality', 'medium'), SHORT_BITRATES['medium'])
+
+            if not options.get('resize_to_vertical', False) and not has_text:
+                # Plain cut: stream copy skips decoding and re-encoding entirely
+                cut_ok, cut_error = extractor.extract_subclip(video_path, 0, duration, str(output_path))
+                if not cut_ok:
+                    raise VideoProcessingError(cut_error)
+            elif not has_text:
+                # Crop and scale fused into one ffmpeg filter graph
+                cut_ok, cut_error = extractor.render_vertical_subclip(video_path, 0, duration,
+                                                                      str(output_path), bitrate)
+                if not cut_ok:
+                    raise VideoProcessingError(cut_error)
+            else:
+                # Subclip view of the shared reader; no new ffmpeg process
+                short_clip = extractor.open_clip(video_path).subclip(0, duration)
+
+                # Apply resize for vertical format if requested
+                if options.get('resize_to_vertical', False):
+                    w, h = short_clip.size
+                    if w/h > 9/16:  # Too wide, crop sides
+                        new_w = int(h * 9/16)
+                        short_clip = short_clip.crop(x1=(w-new_w)//2, x2=(w+new_w)//2)
+                    # Resize to standard shorts resolution
+                    short_clip = short_clip.resize((1080, 1920))
+
+                # Add the text overlay (this branch only runs when has_text)
+                txt_clip = TextClip(text_overlay['text'],
+                                    fontsize=text_overlay.get('fontsize', 50),
+                                    color=text_overlay.get('color', 'white'),
+                                    stroke_color=text_overlay.get('stroke_color', 'black'),
+                                    stroke_width=text_overlay.get('stroke_width', 2))
+
+                position = text_overlay.get('position', 'bottom')
+                if position == 'bottom':
+                    txt_clip = txt_clip.set_position(('center', 'bottom')).set_margin(50)
+                elif position == 'top':
+                    txt_clip = txt_clip.set_position(('center', 'top')).set_margin(50)
+                else:
+                    txt_clip = txt_clip.set_position('center')
+
+                txt_clip = txt_clip.set_duration(short_clip.duration)
+                short_clip = CompositeVideoClip([short_clip, txt_clip])
+
+                # Write video file with quality settings
+                _encode(short_clip, output_path, bitrate)
+
+            return {
+                'success': True,
+                'message': 'Short video created successfully',
+                'filename': f"{output_name}.mp4",
+                'title': video_title,
+                'duration': duration,
+                'start_time': start_time,
+                'download_url': f'/shorts/{output_name}.mp4'
+            }, 200
+
+        except Exception as e:
+            app_logger.error(f"Failed to create short video: {str(e)}")
+            return {'error': f'Failed to create short video: {str(e)}'}, 500
+
+# Background short-video jobs; renders run in ffmpeg subprocesses, so threads
+# are enough to keep request workers free while they encode. Job state lives in
+# the database so a status poll can land on any worker process.
+SHORT_JOB_TTL_SECONDS = 6 * 60 * 60
+# A job still 'processing' after this long lost its worker (restart, deploy, crash)
+SHORT_JOB_MAX_RENDER_SECONDS = 15 * 60
+_short_job_executor = ThreadPoolExecutor(max_workers=max(2, os.cpu_count() or 1), thread_name_prefix='short-job')
+
+def _run_short_job(job_id: str, url: str, start_time: float, duration: float, options: Dict[str, Any]):
+    """Build the short and store its response for the status endpoint"""
+    try:
+        payload, status = build_short_video(url, start_time, duration, options)
+    except Exception as e:
+        app_logger.error(f"Short video job {job_id} failed: {str(e)}")
+        payload, status = {'error': f'Short video creation failed: {str(e)}'}, 500
+    db_manager.finish_short_job(job_id, payload, status)
+
+def submit_short_job(url: str, start_time: float, duration: float, options: Dict[str, Any]) -> str:
+    """Queue a short-video build and return its job ID"""
+    job_id = uuid.uuid4().hex
+    db_manager.create_short_job(job_id)
+    # Run in a copy of the request's context so the job's log lines keep its log_context
+    _short_job_executor.submit(contextvars.copy_context().run, _run_short_job, job_id, url, start_time, duration, options)
+    return job_id
 
 def create_app(config_name: str = None) -> Flask:
     """Application factory pattern"""
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
     
     # Load configuration
     config = get_config()
@@ -232,6 +534,9 @@ def create_app(config_name: str = None) -> Flask:
     if not config.DEBUG:
         app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_port=1)
     
+    # Compress JSON/HTML responses (settings come from COMPRESS_* in config)
+    Compress(app)
+    
     # Setup rate limiter
     limiter = Limiter(
         key_func=get_remote_address,
@@ -244,15 +549,17 @@ def create_app(config_name: str = None) -> Flask:
     @app.before_request
     def log_request_info():
         request.start_time = time.time()
+        user_ip = get_remote_address()
+        
+        # Every log record written while handling this request carries these fields
+        request.log_context_token = log_context.set({'user_ip': user_ip, 'request_id': uuid.uuid4().hex})
         
         # Rate limit check
-        user_ip = get_remote_address()
         is_allowed, remaining = validator.check_rate_limit(user_ip)
         
         if not is_allowed:
             app_logger.warning(
                 "Rate limit exceeded",
-                user_ip=user_ip,
                 endpoint=request.endpoint,
                 user_agent=request.headers.get('User-Agent', 'Unknown')
             )
@@ -281,6 +588,12 @@ def create_app(config_name: str = None) -> Flask:
         
         return response
     
+    @app.teardown_request
+    def clear_log_context(error=None):
+        token = getattr(request, 'log_context_token', None)
+        if token is not None:
+            log_context.reset(token)
+    
     # Error handlers
     @app.errorhandler(400)
     def bad_request(error):
@@ -329,9 +642,9 @@ def create_app(config_name: str = None) -> Flask:
         """Validate URL and detect platform"""
         with LogContext(api_logger, "URL validation"):
             try:
-                data = request.get_json()
-                if not data or 'url' not in data:
-                    return jsonify({'success': False, 'error': 'URL is required'}), 400
+                data, body_error = parse_json_body('url')
+                if body_error:
+                    return jsonify({'success': False, 'error': body_error}), 400
                 
                 url = data['url']
                 is_valid, platform, error = validator.validate_url(url)
@@ -344,7 +657,7 @@ def create_app(config_name: str = None) -> Flask:
                     })
                 
                 # Get video info for additional validation
-                info_success, video_info, info_error = extractor.get_video_info(url)
+                info_success, video_info, info_error = get_extractor().get_video_info(url)
                 
                 response_data = {
                     'success': True,
@@ -374,16 +687,14 @@ def create_app(config_name: str = None) -> Flask:
         """Extract frames from video at specified timestamps"""
         with LogContext(api_logger, "Frame extraction"):
             try:
-                data = request.get_json()
-                if not data:
-                    return jsonify({'success': False, 'error': 'No data provided'}), 400
+                data, body_error = parse_json_body('url')
+                if body_error:
+                    return jsonify({'success': False, 'error': body_error}), 400
                 
-                url = data.get('url')
+                url = data['url']
                 timestamps = data.get('timestamps', [])
-                
-                # Validate inputs
-                if not url:
-                    return jsonify({'success': False, 'error': 'URL is required'}), 400
+                if not isinstance(timestamps, list):
+                    return jsonify({'success': False, 'error': 'timestamps must be a list'}), 400
                 
                 # Validate URL
                 is_valid_url, platform, url_error = validator.validate_url(url)
@@ -405,40 +716,30 @@ def create_app(config_name: str = None) -> Flask:
                 )
                 
                 # Download video
-                video_path, title, download_error = extractor.download_video(url)
+                video_path, title, download_error = get_extractor().download_video(url)
                 if not video_path:
                     return jsonify({'success': False, 'error': download_error or 'Download failed'}), 400
                 
-                # Extract frames
+                # Extract frames (concurrently; results come back in timestamp order)
                 extracted_frames = []
                 errors = []
                 
-                for i, timestamp in enumerate(valid_seconds):
-                    try:
-                        # Generate unique filename
-                        frame_id = f"frame_{timestamp}s_{str(uuid.uuid4())[:8]}"
-                        frame_filename = f"{frame_id}.jpg"
-                        frame_path = os.path.join(config.FRAMES_FOLDER, frame_filename)
-                        
-                        # Extract frame
-                        success, frame_error = extractor.extract_frame_at_timestamp(
-                            video_path, timestamp, frame_path
-                        )
-                        
-                        if success:
-                            extracted_frames.append({
-                                'timestamp': timestamp,
-                                'filename': frame_filename,
-                                'url': f'/frames/{frame_filename}'
-                            })
-                        else:
-                            errors.append(f"Timestamp {timestamp}s: {frame_error}")
-                            
-                    except Exception as e:
-                        error_msg = f"Timestamp {timestamp}s: {str(e)}"
-                        errors.append(error_msg)
-                        app_logger.warning("Frame extraction error", 
-                                         timestamp=timestamp, error=str(e))
+                # Generate unique filenames
+                frame_filenames = [f"frame_{timestamp}s_{str(uuid.uuid4())[:8]}.jpg" for timestamp in valid_seconds]
+                frame_results = get_extractor().extract_frames(video_path, [
+                    (timestamp, os.path.join(config.FRAMES_FOLDER, frame_filename))
+                    for timestamp, frame_filename in zip(valid_seconds, frame_filenames)
+                ])
+                
+                for timestamp, frame_filename, (success, frame_error) in zip(valid_seconds, frame_filenames, frame_results):
+                    if success:
+                        extracted_frames.append({
+                            'timestamp': timestamp,
+                            'filename': frame_filename,
+                            'url': f'/frames/{frame_filename}'
+                        })
+                    else:
+                        errors.append(f"Timestamp {timestamp}s: {frame_error}")
                 
                 # Clean up video file
                 try:
@@ -486,9 +787,9 @@ def create_app(config_name: str = None) -> Flask:
         """Get video information without downloading"""
         with LogContext(api_logger, "Video info request"):
             try:
-                data = request.get_json()
-                if not data or 'url' not in data:
-                    return jsonify({'success': False, 'error': 'URL is required'}), 400
+                data, body_error = parse_json_body('url')
+                if body_error:
+                    return jsonify({'success': False, 'error': body_error}), 400
                 
                 url = data['url']
                 
@@ -498,7 +799,7 @@ def create_app(config_name: str = None) -> Flask:
                     return jsonify({'success': False, 'error': error}), 400
                 
                 # Get video info
-                success, video_info, info_error = extractor.get_video_info(url)
+                success, video_info, info_error = get_extractor().get_video_info(url)
                 
                 if not success:
                     return jsonify({'success': False, 'error': info_error}), 400
@@ -521,7 +822,7 @@ def create_app(config_name: str = None) -> Flask:
         """Clean up old files"""
         with LogContext(api_logger, "File cleanup"):
             try:
-                files_deleted, space_freed, errors = extractor.cleanup_old_files()
+                files_deleted, space_freed, errors = get_extractor().cleanup_old_files()
                 
                 response_data = {
                     'success': True,
@@ -546,20 +847,17 @@ def create_app(config_name: str = None) -> Flask:
     def serve_frame(filename):
         """Serve extracted frame files"""
         # Validate filename to prevent directory traversal
-        safe_filename = validator.sanitize_filename(filename)
-        if safe_filename != filename:
+        if not _SAFE_FRAME_FILENAME.fullmatch(filename):
             return jsonify({'error': 'Invalid filename'}), 400
         
-        return send_from_directory(config.FRAMES_FOLDER, filename)
+        # Frame names are unique per extraction, so browsers may cache them
+        return send_from_directory(config.FRAMES_FOLDER, filename, max_age=3600)
     
     @app.route('/api/health')
     def health_check():
         """Health check endpoint"""
-        return jsonify({
-            'status': 'healthy',
-            'timestamp': datetime.now().isoformat(),
-            'version': '2.0.0'
-        })
+        timestamp = datetime.now().isoformat().encode('ascii')
+        return json_bytes_response(_HEALTH_PREFIX + timestamp + _HEALTH_SUFFIX)
     
     @app.route('/dashboard')
     def dashboard():
@@ -569,12 +867,7 @@ def create_app(config_name: str = None) -> Flask:
             analytics = get_analytics()
             
             # Get system information
-            import psutil
-            system_info = {
-                'cpu_percent': psutil.cpu_percent(),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_usage': psutil.disk_usage('/').percent if hasattr(psutil.disk_usage('/'), 'percent') else 0
-            }
+            system_info = get_system_info()
             
             # Get recent requests
             recent_requests = get_recent_requests(limit=10)
@@ -595,14 +888,7 @@ def create_app(config_name: str = None) -> Flask:
         """API endpoint for dashboard data"""
         try:
             analytics = get_analytics()
-            
-            import psutil
-            system_info = {
-                'cpu_percent': psutil.cpu_percent(),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_usage': psutil.disk_usage('/').percent if hasattr(psutil.disk_usage('/'), 'percent') else 0,
-                'uptime': time.time() - psutil.boot_time() if hasattr(psutil, 'boot_time') else 0
-            }
+            system_info = get_system_info()
             
             recent_requests = get_recent_requests(limit=5)
             
@@ -656,13 +942,13 @@ def create_app(config_name: str = None) -> Flask:
     def test_platform_compatibility():
         """Test platform compatibility and provide specific guidance"""
         try:
-            data = request.get_json()
-            url = data.get('url', '').strip()
+            data, body_error = parse_json_body('url')
+            if body_error:
+                return jsonify({'error': body_error}), 400
             
-            if not url:
-                return jsonify({'error': 'URL is required'})
+            url = data['url'].strip()
             
-            platform = validator.get_platform_from_url(url)
+            platform = cached_platform_from_url(url)
             
             # Platform-specific guidance
             guidance = {
@@ -718,20 +1004,16 @@ def create_app(config_name: str = None) -> Flask:
     @app.route('/api/platform-status')
     def get_platform_status():
         """Get the status of supported platforms"""
-        platforms = {
-            'youtube': {'name': '📺 YouTube', 'status': 'active', 'note': 'Fully supported'},
-            'tiktok': {'name': '🎵 TikTok', 'status': 'active', 'note': 'Enhanced format support'},
-            'facebook': {'name': '📘 Facebook', 'status': 'active', 'note': 'Public videos supported'},
-            'douyin': {'name': '🎨 Douyin', 'status': 'active', 'note': 'Chinese TikTok version'},
-            'instagram': {'name': '📸 Instagram', 'status': 'active', 'note': 'Posts and Reels supported'}
-        }
-        return jsonify(platforms)
+        return json_bytes_response(_PLATFORM_STATUS_JSON)
     
     @app.route('/api/test-ytdlp', methods=['POST'])
     def test_ytdlp():
         """Test endpoint to debug yt-dlp issues"""
         try:
-            data = request.get_json()
+            data, body_error = parse_json_body()
+            if body_error:
+                return jsonify({'success': False, 'error': body_error}), 400
+            
             url = data.get('url', 'https://www.youtube.com/watch?v=dQw4w9WgXcQ')
             
             # Test yt-dlp directly in Flask context
@@ -762,33 +1044,11 @@ def create_app(config_name: str = None) -> Flask:
     @app.route('/api/video-categories', methods=['GET'])
     def get_video_categories():
         """Get YouTube video categories"""
-        try:
-            # Common YouTube categories
-            categories = [
-                {'id': '1', 'name': 'Film & Animation'},
-                {'id': '2', 'name': 'Autos & Vehicles'},
-                {'id': '10', 'name': 'Music'},
-                {'id': '15', 'name': 'Pets & Animals'},
-                {'id': '17', 'name': 'Sports'},
-                {'id': '19', 'name': 'Travel & Events'},
-                {'id': '20', 'name': 'Gaming'},
-                {'id': '22', 'name': 'People & Blogs'},
-                {'id': '23', 'name': 'Comedy'},
-                {'id': '24', 'name': 'Entertainment'},
-                {'id': '25', 'name': 'News & Politics'},
-                {'id': '26', 'name': 'Howto & Style'},
-                {'id': '27', 'name': 'Education'},
-                {'id': '28', 'name': 'Science & Technology'}
-            ]
-            
-            return jsonify({
-                'categories': categories,
-                'total': len(categories)
-            })
-            
-        except Exception as e:
-            app_logger.error(f"Categories error: {str(e)}")
-            return jsonify({'error': 'Failed to fetch categories'}), 500
+        response = json_bytes_response(_VIDEO_CATEGORIES_JSON)
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        response.set_etag(_VIDEO_CATEGORIES_ETAG)
+        return response.make_conditional(request)
     
     @app.route('/api/search', methods=['POST'])
     def search_videos():
@@ -800,10 +1060,18 @@ def create_app(config_name: str = None) -> Flask:
             max_results = min(int(data.get('max_results', 10)), 50)
             
             if not query:
-                return jsonify({'error': 'Search query is required'}), 400
+                return json_bytes_response(_ERR_SEARCH_QUERY_REQUIRED, 400)
             
             if platform != 'youtube':
-                return jsonify({'error': 'Only YouTube search is currently supported'}), 400
+                return json_bytes_response(_ERR_SEARCH_PLATFORM_UNSUPPORTED, 400)
+            
+            # Exact query: the cached body echoes it back in ids, titles and 'query'
+            cache_key = (platform, query, max_results)
+            with _search_cache_lock:
+                cached_body = _search_cache.get(cache_key)
+                _search_cache_stats['hits' if cached_body is not None else 'misses'] += 1
+            if cached_body is not None:
+                return json_bytes_response(cached_body)
             
             # For demo purposes, return sample search results
             sample_results = [
@@ -831,18 +1099,37 @@ def create_app(config_name: str = None) -> Flask:
                 }
             ]
             
-            return jsonify({
+            videos = sample_results[:max_results]
+            body = orjson.dumps({
                 'success': True,
                 'platform': platform,
-                'videos': sample_results[:max_results],
+                'videos': videos,
                 'total': len(sample_results),
                 'query': query
             })
             
+            # Only successful, non-empty results are worth caching
+            if videos:
+                with _search_cache_lock:
+                    _search_cache[cache_key] = body
+            
+            return json_bytes_response(body)
+            
         except Exception as e:
             app_logger.error(f"Video search error: {str(e)}")
             return jsonify({'error': f'Failed to search videos: {str(e)}'}), 500
     
+    @app.route('/api/search/cache-stats')
+    def search_cache_stats():
+        """Get search result cache statistics"""
+        with _search_cache_lock:
+            return jsonify({
+                'size': len(_search_cache),
+                'maxsize': _search_cache.maxsize,
+                'ttl_seconds': SEARCH_CACHE_TTL_SECONDS,
+                **_search_cache_stats
+            })
+    
     @app.route('/api/create-short', methods=['POST'])
     def create_short_video():
         """Create a short video from a longer video"""
@@ -856,32 +1143,39 @@ def create_app(config_name: str = None) -> Flask:
             start_time = data.get('start_time', 0)  # in seconds
             duration = data.get('duration', 30)  # default 30 seconds
             
+            # Collect every input problem so the client can fix them in one go
+            errors = []
+            
             # Validate required fields
             if not url:
-                return jsonify({'error': 'URL is required'}), 400
-            
-            # Validate URL
-            is_valid_url, platform, url_error = validator.validate_url(url)
-            if not is_valid_url:
-                return jsonify({'error': f'Invalid URL: {url_error or "URL must be from a supported platform"}'}), 400
+                errors.append('URL is required')
+            else:
+                # Validate URL
+                is_valid_url, platform, url_error = validator.validate_url(url)
+                if not is_valid_url:
+                    errors.append(f'Invalid URL: {url_error or "URL must be from a supported platform"}')
             
             # Parse start_time if it's a string (e.g., "1:30")
             if isinstance(start_time, str):
                 try:
+                    start_time = start_time.strip()
                     if ':' in start_time:
+                        # SS, MM:SS and HH:MM:SS all reduce to sum(part * 60**position)
                         parts = start_time.split(':')
-                        if len(parts) == 2:
-                            start_time = int(parts[0]) * 60 + int(parts[1])
-                        else:
-                            start_time = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+                        if len(parts) > 3:
+                            raise ValueError(start_time)
+                        start_time = sum(int(part) * 60 ** i for i, part in enumerate(reversed(parts)))
                     else:
                         start_time = float(start_time)
                 except ValueError:
-                    return jsonify({'error': 'Invalid start_time format. Use seconds or MM:SS format'}), 400
+                    errors.append('Invalid start_time format. Use seconds or MM:SS format')
             
             # Validate duration
-            if duration <= 0 or duration > 300:  # Max 5 minutes for shorts
-                return jsonify({'error': 'Duration must be between 1 and 300 seconds'}), 400
+            if not isinstance(duration, (int, float)) or duration <= 0 or duration > 300:  # Max 5 minutes for shorts
+                errors.append('Duration must be between 1 and 300 seconds')
+            
+            if errors:
+                return jsonify({'error': '; '.join(errors), 'errors': errors}), 400
             
             # Options for video creation
             options = {
@@ -890,116 +1184,65 @@ def create_app(config_name: str = None) -> Flask:
                 'text_overlay': data.get('text_overlay'),  # Optional text overlay
             }
             
-            with LogContext(api_logger, "Short video creation"):
-                # Download video using the enhanced video processor
-                try:
-                    video_path, video_title, metadata = extractor.download_video(url)
-                except Exception as e:
-                    app_logger.error(f"Failed to download video: {str(e)}")
-                    return jsonify({'error': 'Failed to download video'}), 500
-                
-                if not video_path:
-                    return jsonify({'error': 'Failed to download video'}), 500
-                
-                # Generate unique filename
-                import uuid
-                unique_id = str(uuid.uuid4())[:8]
-                safe_title = "".join(c for c in (video_title or "short")[:50] if c.isalnum() or c in (' ', '-', '_')).strip()
-                output_name = f"{safe_title}_{unique_id}_short"
-                
-                # Create short video using moviepy
-                try:
-                    from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip
-                    
-                    config = get_config()
-                    output_path = config.SHORTS_FOLDER / f"{output_name}.mp4"
-                    
-                    # Load video
-                    video = VideoFileClip(video_path)
-                    
-                    # Validate start_time against video duration
-                    if start_time >= video.duration:
-                        video.close()
-                        return jsonify({'error': f'Start time ({start_time}s) exceeds video duration ({video.duration:.1f}s)'}), 400
-                    
-                    # Adjust duration if it exceeds video length
-                    if start_time + duration > video.duration:
-                        duration = video.duration - start_time
-                    
-                    # Extract the clip
-                    short_clip = video.subclip(start_time, start_time + duration)
-                    
-                    # Apply resize for vertical format if requested
-                    if options.get('resize_to_vertical', False):
-                        w, h = short_clip.size
-                        if w/h > 9/16:  # Too wide, crop sides
-                            new_w = int(h * 9/16)
-                            short_clip = short_clip.crop(x1=(w-new_w)//2, x2=(w+new_w)//2)
-                        # Resize to standard shorts resolution
-                        short_clip = short_clip.resize((1080, 1920))
-                    
-                    # Add text overlay if specified
-                    if options.get('text_overlay') and options['text_overlay'].get('text'):
-                        text_config = options['text_overlay']
-                        txt_clip = TextClip(text_config.get('text', ''), 
-                                          fontsize=text_config.get('fontsize', 50),
-                                          color=text_config.get('color', 'white'),
-                                          stroke_color=text_config.get('stroke_color', 'black'),
-                                          stroke_width=text_config.get('stroke_width', 2))
-                        
-                        position = text_config.get('position', 'bottom')
-                        if position == 'bottom':
-                            txt_clip = txt_clip.set_position(('center', 'bottom')).set_margin(50)
-                        elif position == 'top':
-                            txt_clip = txt_clip.set_position(('center', 'top')).set_margin(50)
-                        else:
-                            txt_clip = txt_clip.set_position('center')
-                        
-                        txt_clip = txt_clip.set_duration(short_clip.duration)
-                        short_clip = CompositeVideoClip([short_clip, txt_clip])
-                    
-                    # Write video file with quality settings
-                    quality = options.get('quality', 'medium')
-                    if quality == 'high':
-                        short_clip.write_videofile(str(output_path), codec='libx264', bitrate='5000k', verbose=False, logger=None)
-                    elif quality == 'low':
-                        short_clip.write_videofile(str(output_path), codec='libx264', bitrate='1000k', verbose=False, logger=None)
-                    else:  # medium
-                        short_clip.write_videofile(str(output_path), codec='libx264', bitrate='2000k', verbose=False, logger=None)
-                    
-                    # Clean up
-                    video.close()
-                    short_clip.close()
-                    
-                    return jsonify({
-                        'success': True,
-                        'message': 'Short video created successfully',
-                        'filename': f"{output_name}.mp4",
-                        'title': video_title,
-                        'duration': duration,
-                        'start_time': start_time,
-                        'download_url': f'/shorts/{output_name}.mp4'
-                    })
-                    
-                except Exception as e:
-                    app_logger.error(f"Failed to create short video: {str(e)}")
-                    return jsonify({'error': f'Failed to create short video: {str(e)}'}), 500
+            if data.get('async'):
+                job_id = submit_short_job(url, start_time, duration, options)
+                return jsonify({
+                    'job_id': job_id,
+                    'status': 'processing',
+                    'status_url': f'/api/create-short/{job_id}'
+                }), 202
+            
+            payload, status = build_short_video(url, start_time, duration, options)
+            return jsonify(payload), status
         
         except Exception as e:
             app_logger.error(f"Short video creation error: {str(e)}")
             return jsonify({'error': f'Short video creation failed: {str(e)}'}), 500
     
+    @app.route('/api/create-short/<job_id>')
+    def short_video_job_status(job_id):
+        """Poll a background short-video job"""
+        job = db_manager.get_short_job(job_id, SHORT_JOB_TTL_SECONDS)
+        
+        if job is None:
+            return jsonify({'error': 'Job not found or expired'}), 404
+        
+        if job['status'] == 'processing':
+            if job['age_seconds'] > SHORT_JOB_MAX_RENDER_SECONDS:
+                return jsonify({
+                    'error': 'Short video job did not finish, please try again',
+                    'job_id': job_id,
+                    'status': 'failed'
+                }), 500
+            return jsonify({'job_id': job_id, 'status': 'processing'}), 202
+        
+        return jsonify({**job['payload'], 'job_id': job_id, 'status': job['status']}), job['http_status']
+    
     @app.route('/shorts/<filename>')
     def serve_short_video(filename):
         """Serve generated short videos"""
-        config = get_config()
-        return send_from_directory(str(config.SHORTS_FOLDER), filename)
+        if config.USE_X_ACCEL:
+            # nginx serves the file itself with sendfile(2); Flask only authorizes the path
+            if not safe_join(str(config.SHORTS_FOLDER), filename):
+                return jsonify({'error': 'Invalid filename'}), 400
+            response = Response(mimetype='video/mp4')
+            response.headers['X-Accel-Redirect'] = config.X_ACCEL_SHORTS_PREFIX + quote(filename)
+        else:
+            # Conditional + range-aware; the WSGI server's file_wrapper streams the body
+            response = send_from_directory(str(config.SHORTS_FOLDER), filename, conditional=True, etag=True,
+                                           max_age=31536000)
+        
+        # Shorts are never rewritten (the name carries a UUID slice), so caches may keep them for good
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+        return response
     
     @app.route('/api/youtube-auth', methods=['GET'])
     def youtube_auth():
         """Start YouTube OAuth2 authentication"""
         try:
-            success, auth_url = youtube_uploader.authenticate()
+            success, auth_url = get_uploader().authenticate()
             if success:
                 return jsonify({'authenticated': True, 'message': 'Already authenticated'})
             else:
@@ -1018,7 +1261,7 @@ def create_app(config_name: str = None) -> Flask:
             if not auth_code:
                 return jsonify({'error': 'Authorization code required'}), 400
             
-            success, message = youtube_uploader.complete_auth(
+            success, message = get_uploader().complete_auth(
                 auth_code, 
                 "http://localhost:8080/oauth2callback"
             )
@@ -1046,22 +1289,32 @@ def create_app(config_name: str = None) -> Flask:
             if not video_path:
                 return jsonify({'error': 'Video path required'}), 400
             
-            if not os.path.exists(video_path):
+            uploader = get_uploader()
+            
+            # One stat serves the existence, size and upload checks below
+            try:
+                file_stat = os.stat(video_path)
+            except FileNotFoundError:
                 return jsonify({'error': 'Video file not found'}), 404
+            file_size = file_stat.st_size
+            
+            if file_size > uploader.SHORTS_MAX_FILE_SIZE:
+                return jsonify({'error': 'Video file too large (max 2GB)'}), 413
             
             # Validate video for YouTube Shorts
-            is_valid, validation_msg = youtube_uploader.validate_short_video(video_path)
+            is_valid, validation_msg = uploader.validate_short_video(video_path, size_hint=file_size)
             if not is_valid:
                 return jsonify({'error': f'Video validation failed: {validation_msg}'}), 400
             
             # Upload to YouTube
-            success, message, video_id = youtube_uploader.upload_video(
+            success, message, video_id = uploader.upload_video(
                 video_path=video_path,
                 title=title,
                 description=description,
                 tags=tags,
                 privacy_status=privacy,
-                is_short=True
+                is_short=True,
+                stat_result=file_stat
             )
             
             if success:
@@ -1083,15 +1336,12 @@ def create_app(config_name: str = None) -> Flask:
     def youtube_quota():
         """Get YouTube API quota information"""
         try:
-            quota_info = youtube_uploader.get_upload_quota_info()
+            quota_info = get_uploader().get_upload_quota_info()
             return jsonify(quota_info)
         except Exception as e:
             app_logger.error(f"YouTube quota error: {str(e)}")
             return jsonify({'error': str(e)}), 500
     
-    # Import uuid here to avoid circular imports
-    import uuid
-    
     return app
 
 def main():
@@ -3,6 +3,7 @@ Configuration management for Video Frame Extractor
 Centralizes all configuration settings with environment-based overrides
 """
 import os
+import re
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -18,6 +19,8 @@ class Config:
     FRAMES_FOLDER = BASE_DIR / 'extracted_frames'
     SHORTS_FOLDER = BASE_DIR / 'generated_shorts'
     LOGS_FOLDER = BASE_DIR / 'logs'
+    # Resumable upload session URIs; private, never under a served folder
+    UPLOAD_SESSIONS_FOLDER = BASE_DIR / 'upload_sessions'
     
     # Flask configuration
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
@@ -25,6 +28,16 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-key-change-in-production')
     MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB max upload
     
+    # Response compression (Flask-Compress); images are already compressed
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_MIN_SIZE = 512
+    COMPRESS_MIMETYPES = [
+        'application/json',
+        'text/html',
+        'text/css',
+        'application/javascript'
+    ]
+    
     # API Configuration
     YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY', '')
     YOUTUBE_API_SERVICE_NAME = 'youtube'
@@ -42,10 +55,23 @@ class Config:
         'instagram.com', 'www.instagram.com'
     ]
     
+    # One compiled matcher for the allowlist: a supported host or any subdomain of it
+    # (matched against urlparse's hostname, which is already lowercase)
+    PLATFORM_HOST_RE = re.compile(
+        r'(?:[^.]+\.)*(?:' + '|'.join(re.escape(host) for host in SUPPORTED_PLATFORMS) + r')'
+    )
+    
+    # Let nginx stream generated shorts via X-Accel-Redirect (see deploy.py)
+    USE_X_ACCEL = os.getenv('USE_X_ACCEL', '').lower() in ('1', 'true', 'yes')
+    X_ACCEL_SHORTS_PREFIX = '/_shorts_internal/'
+    
     # Video processing settings
     DEFAULT_VIDEO_QUALITY = '720'
     MAX_VIDEO_DURATION = int(os.getenv('MAX_VIDEO_DURATION', '3600'))  # 1 hour
     FRAME_EXTRACTION_TIMEOUT = int(os.getenv('FRAME_EXTRACTION_TIMEOUT', '300'))  # 5 minutes
+    FRAME_JPEG_QUALITY = int(os.getenv('FRAME_JPEG_QUALITY', '85'))  # 0-100, OpenCV default is 95
+    # Extract single frames with an ffmpeg input seek (falls back to OpenCV per frame)
+    USE_FFMPEG_FRAME = os.getenv('USE_FFMPEG_FRAME', '').lower() in ('1', 'true', 'yes')
     
     # Cookie settings
     COOKIE_BROWSERS = ['chrome', 'firefox', 'edge', 'safari']
@@ -59,6 +85,7 @@ class Config:
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     LOG_FILE = LOGS_FOLDER / 'app.log'
+    LOG_DEBUG_SAMPLE_RATE = int(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1'))  # keep 1 in N DEBUG records in the log file
     
     @classmethod
     def ensure_directories(cls):
@@ -71,6 +98,7 @@ class Config:
         ]
         for directory in directories:
             directory.mkdir(exist_ok=True, parents=True)
+        cls.UPLOAD_SESSIONS_FOLDER.mkdir(mode=0o700, exist_ok=True, parents=True)
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -112,13 +140,19 @@ config = {
     'default': DevelopmentConfig
 }
 
+# Config classes that have already been validated and had their folders created
+_initialized_configs = set()
+
 def get_config() -> Config:
     """Get configuration based on environment"""
     env = os.getenv('FLASK_ENV', 'development')
     config_class = config.get(env, config['default'])
     
-    if env == 'production':
-        config_class.validate_production_config()
-    
-    config_class.ensure_directories()
+    # One-time setup per config class; later calls skip the mkdir syscalls
+    if config_class not in _initialized_configs:
+        if env == 'production':
+            config_class.validate_production_config()
+        
+        config_class.ensure_directories()
+        _initialized_configs.add(config_class)
     return config_class
@@ -2,89 +2,374 @@
 Database models for enhanced data management and analytics
 Using SQLite for simplicity, can be easily upgraded to PostgreSQL
 """
+import os
+import atexit
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 import json
 
 from config import get_config
 from logger import app_logger
 
+# Whole schema as one script; every statement is idempotent so it runs on each start
+SCHEMA_SQL = '''
+-- Platform and action names are stored once; rows carry the small integer id
+CREATE TABLE IF NOT EXISTS platforms (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+-- Video processing requests table
+CREATE TABLE IF NOT EXISTS video_requests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url_hash TEXT NOT NULL,
+    platform_id INTEGER NOT NULL REFERENCES platforms (id),
+    title TEXT,
+    duration INTEGER,
+    status TEXT DEFAULT 'pending',
+    error_message TEXT,
+    user_ip TEXT,
+    user_agent TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    processing_time_ms INTEGER
+);
+
+-- Extracted frames table
+CREATE TABLE IF NOT EXISTS extracted_frames (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id INTEGER,
+    timestamp INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    file_size INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (request_id) REFERENCES video_requests (id)
+);
+
+-- System statistics table
+CREATE TABLE IF NOT EXISTS system_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    metric_name TEXT NOT NULL,
+    metric_value REAL NOT NULL,
+    metadata TEXT,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- User analytics table
+CREATE TABLE IF NOT EXISTS user_analytics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_ip TEXT NOT NULL,
+    platform_id INTEGER NOT NULL REFERENCES platforms (id),
+    action_id INTEGER NOT NULL REFERENCES actions (id),
+    success BOOLEAN DEFAULT 0,
+    response_time_ms INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Range seek on created_at for the per-platform statistics GROUP BY
+CREATE INDEX IF NOT EXISTS idx_vr_created_platform_status ON video_requests(created_at, platform_id, status);
+-- Partial index: error analysis only ever looks at failed requests
+CREATE INDEX IF NOT EXISTS idx_vr_status_created ON video_requests(status, created_at) WHERE status = 'failed';
+CREATE INDEX IF NOT EXISTS idx_ef_request_created ON extracted_frames(request_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_ef_created_at ON extracted_frames(created_at);
+-- Superseded by the composites above (each was unused or a left prefix of one)
+DROP INDEX IF EXISTS idx_video_requests_platform;
+DROP INDEX IF EXISTS idx_video_requests_created_at;
+DROP INDEX IF EXISTS idx_extracted_frames_request_id;
+CREATE INDEX IF NOT EXISTS idx_user_analytics_platform ON user_analytics(platform_id);
+CREATE INDEX IF NOT EXISTS idx_user_analytics_created_at ON user_analytics(created_at);
+
+-- Dashboard totals, maintained incrementally alongside each write
+CREATE TABLE IF NOT EXISTS analytics_summary (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_requests INTEGER NOT NULL,
+    successful_requests INTEGER NOT NULL,
+    total_frames INTEGER NOT NULL,
+    sum_processing_ms INTEGER NOT NULL,
+    count_processing INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS platform_counts (
+    platform TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+
+-- Background short-video jobs; shared so any worker process can answer a status poll
+CREATE TABLE IF NOT EXISTS short_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'processing',
+    http_status INTEGER,
+    payload TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+'''
+
+# One-time move of databases created before the lookup tables: the old tables are
+# renamed aside (legacy mode keeps extracted_frames pointing at 'video_requests'),
+# SCHEMA_SQL creates the new ones, and the rows are copied across with their ids
+LEGACY_RENAME_SQL = '''
+ALTER TABLE video_requests RENAME TO video_requests_legacy;
+ALTER TABLE user_analytics RENAME TO user_analytics_legacy;
+DROP INDEX IF EXISTS idx_vr_created_platform_status;
+DROP INDEX IF EXISTS idx_vr_status_created;
+DROP INDEX IF EXISTS idx_user_analytics_platform;
+DROP INDEX IF EXISTS idx_user_analytics_created_at;
+'''
+LEGACY_COPY_SQL = '''
+INSERT OR IGNORE INTO platforms (name)
+    SELECT platform FROM video_requests_legacy UNION SELECT platform FROM user_analytics_legacy;
+INSERT OR IGNORE INTO actions (name)
+    SELECT DISTINCT action FROM user_analytics_legacy;
+INSERT INTO video_requests
+    (id, url_hash, platform_id, title, duration, status, error_message,
+     user_ip, user_agent, created_at, completed_at, processing_time_ms)
+    SELECT vr.id, vr.url_hash, p.id, vr.title, vr.duration, vr.status, vr.error_message,
+           vr.user_ip, vr.user_agent, vr.created_at, vr.completed_at, vr.processing_time_ms
+    FROM video_requests_legacy vr JOIN platforms p ON p.name = vr.platform;
+INSERT INTO user_analytics (id, user_ip, platform_id, action_id, success, response_time_ms, created_at)
+    SELECT ua.id, ua.user_ip, p.id, a.id, ua.success, ua.response_time_ms, ua.created_at
+    FROM user_analytics_legacy ua
+    JOIN platforms p ON p.name = ua.platform
+    JOIN actions a ON a.name = ua.action;
+DROP TABLE video_requests_legacy;
+DROP TABLE user_analytics_legacy;
+'''
+
+# Hot-path statements, shared so every call hits the connection's statement cache
+# INSERT ... RETURNING (SQLite 3.35+) hands back the new id from the same statement
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+SQL_INSERT_REQUEST = '''
+    INSERT INTO video_requests (url_hash, platform_id, title, duration, user_ip, user_agent)
+    VALUES (?, ?, ?, ?, ?, ?)
+''' + ('RETURNING id' if HAS_RETURNING else '')
+SQL_UPDATE_REQUEST = '''
+    UPDATE video_requests
+    SET status = ?, error_message = ?, processing_time_ms = ?,
+        completed_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+SQL_INSERT_FRAME = '''
+    INSERT INTO extracted_frames (request_id, timestamp, filename, file_size)
+    VALUES (?, ?, ?, ?)
+'''
+SQL_INSERT_ANALYTICS = '''
+    INSERT INTO user_analytics (user_ip, platform_id, action_id, success, response_time_ms)
+    VALUES (?, ?, ?, ?, ?)
+'''
+SQL_INSERT_METRIC = '''
+    INSERT INTO system_stats (metric_name, metric_value, metadata)
+    VALUES (?, ?, ?)
+'''
+
+# Running totals for the dashboard, kept in step with every write so reads are O(1)
+SQL_BUMP_REQUESTS = 'UPDATE analytics_summary SET total_requests = total_requests + 1 WHERE id = 1'
+SQL_BUMP_PLATFORM = '''
+    INSERT INTO platform_counts (platform, count) VALUES (?, 1)
+    ON CONFLICT(platform) DO UPDATE SET count = count + 1
+'''
+SQL_ADD_FRAMES = 'UPDATE analytics_summary SET total_frames = total_frames + ? WHERE id = 1'
+SQL_ADJUST_COMPLETION = '''
+    UPDATE analytics_summary
+    SET successful_requests = successful_requests + ?,
+        sum_processing_ms = sum_processing_ms + ?,
+        count_processing = count_processing + ?
+    WHERE id = 1
+'''
+
+# Queued frame/analytics/metric rows are written every FLUSH_INTERVAL_SECONDS or FLUSH_BATCH_SIZE rows
+FLUSH_INTERVAL_SECONDS = 0.1
+FLUSH_BATCH_SIZE = 500
+
+# How often the flush thread refreshes planner statistics with PRAGMA optimize
+OPTIMIZE_INTERVAL_SECONDS = 3600
+
 class DatabaseManager:
     """Enhanced database management with connection pooling and migration support"""
     
     def __init__(self):
         self.config = get_config()
         self.db_path = self.config.BASE_DIR / 'app_data.db'
+        
+        # (table, name) -> id for the platforms/actions lookup tables; names never change id
+        self._lookup_ids = {}
+        
+        # SQLite allows one writer and many WAL readers: a single locked write
+        # connection plus a pool of read-only ones, all opened once
+        self._write_conn = self._connect()
+        self._write_lock = threading.Lock()
         self.init_database()
+        
+        self._read_pool = queue.Queue()
+        for _ in range(os.cpu_count() or 4):
+            self._read_pool.put(self._connect(read_only=True))
+        
+        # Frame, analytics and metric rows are batched into one transaction by a background thread
+        self._pending = queue.Queue()
+        self._last_optimize = time.monotonic()
+        threading.Thread(target=self._flush_loop, name='db-flush', daemon=True).start()
+        atexit.register(self._shutdown)
+    
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the per-connection performance PRAGMAs applied"""
+        if read_only:
+            conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True, timeout=30,
+                                   isolation_level=None, check_same_thread=False,
+                                   cached_statements=256)
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                   check_same_thread=False, cached_statements=256)
+            # synchronous=NORMAL is durable under WAL (only the last commits can be lost on power failure)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA cache_size=-20000')  # ~20MB page cache
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
+    @contextmanager
+    def _write(self):
+        """Hold the shared write connection for the duration of the block"""
+        with self._write_lock:
+            yield self._write_conn
+    
+    def _flush_loop(self):
+        """Drain queued rows in batches for the life of the process"""
+        while True:
+            # An error drops at most the batch in hand; the thread keeps draining the queue
+            try:
+                batch = [self._pending.get()]
+                deadline = time.monotonic() + FLUSH_INTERVAL_SECONDS
+                while len(batch) < FLUSH_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._pending.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                self._write_batch(batch)
+                
+                if time.monotonic() - self._last_optimize > OPTIMIZE_INTERVAL_SECONDS:
+                    self._optimize()
+            except Exception as e:
+                app_logger.error(f"Background database flush failed: {str(e)}")
+    
+    def _optimize(self):
+        """Let SQLite re-analyze tables whose statistics have drifted (near-free when nothing changed)"""
+        try:
+            with self._write() as conn:
+                conn.execute('PRAGMA optimize')
+            self._last_optimize = time.monotonic()
+        except sqlite3.Error as e:
+            app_logger.warning(f"PRAGMA optimize failed: {str(e)}")
+    
+    def _shutdown(self):
+        """Write queued rows and refresh planner statistics before the process exits"""
+        self.flush()
+        self._optimize()
+    
+    def _write_batch(self, batch: List[Tuple[str, tuple]]):
+        """Insert queued (sql, params) rows with one executemany per statement in a single transaction"""
+        batch = self._encode_metrics(batch)
+        rows_by_sql = {}
+        for sql, params in batch:
+            rows_by_sql.setdefault(sql, []).append(params)
+        
+        with self._write() as conn:
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                for sql, rows in rows_by_sql.items():
+                    conn.executemany(sql, rows)
+                if SQL_INSERT_FRAME in rows_by_sql:
+                    conn.execute(SQL_ADD_FRAMES, (len(rows_by_sql[SQL_INSERT_FRAME]),))
+                conn.execute('COMMIT')
+                return
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                app_logger.warning(f"Batch insert failed, retrying row by row: {str(e)}")
+            
+            # One bad row (e.g. a dangling request_id) must not drop the whole batch
+            frames_written = 0
+            for sql, params in batch:
+                try:
+                    conn.execute(sql, params)
+                    frames_written += sql == SQL_INSERT_FRAME
+                except sqlite3.Error as e:
+                    app_logger.error(f"Failed to write queued row: {str(e)}")
+            if frames_written:
+                conn.execute(SQL_ADD_FRAMES, (frames_written,))
+    
+    @staticmethod
+    def _encode_metrics(batch: List[Tuple[str, tuple]]) -> List[Tuple[str, tuple]]:
+        """Serialize queued metric metadata to compact JSON, dropping rows that cannot be encoded"""
+        encoded = []
+        for sql, params in batch:
+            if sql == SQL_INSERT_METRIC:
+                metric_name, metric_value, metadata = params
+                try:
+                    metadata_json = json.dumps(metadata, separators=(',', ':')) if metadata else None
+                except (TypeError, ValueError) as e:
+                    app_logger.error(f"Failed to record system metric: {str(e)}")
+                    continue
+                params = (metric_name, metric_value, metadata_json)
+            encoded.append((sql, params))
+        return encoded
+    
+    def flush(self):
+        """Write all queued rows now"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch)
+    
+    @contextmanager
+    def _read(self):
+        """Check a read-only connection out of the pool"""
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
     
     def init_database(self):
         """Initialize database with required tables"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write() as conn:
                 cursor = conn.cursor()
                 
-                # Video processing requests table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS video_requests (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        url_hash TEXT NOT NULL,
-                        platform TEXT NOT NULL,
-                        title TEXT,
-                        duration INTEGER,
-                        status TEXT DEFAULT 'pending',
-                        error_message TEXT,
-                        user_ip TEXT,
-                        user_agent TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        completed_at TIMESTAMP,
-                        processing_time_ms INTEGER
-                    )
-                ''')
+                # WAL is persistent in the database file: readers no longer block behind writers
+                cursor.execute('PRAGMA journal_mode=WAL')
                 
-                # Extracted frames table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS extracted_frames (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        request_id INTEGER,
-                        timestamp INTEGER NOT NULL,
-                        filename TEXT NOT NULL,
-                        file_size INTEGER,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (request_id) REFERENCES video_requests (id)
-                    )
-                ''')
+                columns = {row['name'] for row in cursor.execute('PRAGMA table_info(video_requests)')}
+                if 'platform' in columns:
+                    self._migrate_to_lookup_tables(conn)
+                else:
+                    # One compiled batch for the whole schema instead of a round trip per statement
+                    cursor.executescript(SCHEMA_SQL)
                 
-                # System statistics table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS system_stats (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        metric_name TEXT NOT NULL,
-                        metric_value REAL NOT NULL,
-                        metadata TEXT,
-                        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # User analytics table  
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS user_analytics (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_ip TEXT NOT NULL,
-                        platform TEXT NOT NULL,
-                        action TEXT NOT NULL,
-                        success BOOLEAN DEFAULT 0,
-                        response_time_ms INTEGER,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Create indexes for better performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_requests_platform ON video_requests(platform)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_requests_created_at ON video_requests(created_at)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_extracted_frames_request_id ON extracted_frames(request_id)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_analytics_platform ON user_analytics(platform)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_analytics_created_at ON user_analytics(created_at)')
+                # Seed the totals from existing history the first time
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    if cursor.execute('SELECT 1 FROM analytics_summary').fetchone() is None:
+                        self._rebuild_summary(cursor)
+                    cursor.execute('COMMIT')
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    raise
                 
                 conn.commit()
                 app_logger.info("Database initialized successfully")
@@ -93,18 +378,73 @@ class DatabaseManager:
             app_logger.error(f"Database initialization failed: {str(e)}")
             raise
     
+    def _migrate_to_lookup_tables(self, conn: sqlite3.Connection):
+        """Rebuild pre-lookup-table video_requests/user_analytics onto platform and action ids"""
+        # Both PRAGMAs are no-ops inside a transaction, so they wrap it
+        conn.execute('PRAGMA foreign_keys=OFF')
+        conn.execute('PRAGMA legacy_alter_table=ON')
+        try:
+            conn.executescript('BEGIN IMMEDIATE;' + LEGACY_RENAME_SQL + SCHEMA_SQL + LEGACY_COPY_SQL + 'COMMIT;')
+            app_logger.info("Migrated platform/action columns to lookup tables")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.execute('PRAGMA legacy_alter_table=OFF')
+            conn.execute('PRAGMA foreign_keys=ON')
+    
+    def _lookup_id(self, table: str, name: str) -> int:
+        """Id of name in the platforms or actions table, adding it on first use"""
+        key = (table, name)
+        lookup_id = self._lookup_ids.get(key)
+        if lookup_id is None:
+            with self._write() as conn:
+                conn.execute(f'INSERT OR IGNORE INTO {table} (name) VALUES (?)', (name,))
+                lookup_id = conn.execute(f'SELECT id FROM {table} WHERE name = ?', (name,)).fetchone()[0]
+            self._lookup_ids[key] = lookup_id
+        return lookup_id
+    
+    def _rebuild_summary(self, cursor: sqlite3.Cursor):
+        """Recompute the dashboard totals from the full tables (inside the caller's transaction)"""
+        cursor.execute('DELETE FROM analytics_summary')
+        cursor.execute('DELETE FROM platform_counts')
+        cursor.execute('''
+            INSERT INTO analytics_summary
+                (id, total_requests, successful_requests, total_frames, sum_processing_ms, count_processing)
+            SELECT 1,
+                   COUNT(*),
+                   COALESCE(SUM(status = 'completed'), 0),
+                   (SELECT COUNT(*) FROM extracted_frames),
+                   COALESCE(SUM(processing_time_ms), 0),
+                   COUNT(processing_time_ms)
+            FROM video_requests
+        ''')
+        cursor.execute('''
+            INSERT INTO platform_counts (platform, count)
+            SELECT p.name, COUNT(*)
+            FROM video_requests vr JOIN platforms p ON p.id = vr.platform_id
+            GROUP BY vr.platform_id
+        ''')
+    
     def log_video_request(self, url_hash: str, platform: str, title: str = None, 
                          duration: int = None, user_ip: str = None, user_agent: str = None) -> int:
         """Log a new video processing request"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO video_requests (url_hash, platform, title, duration, user_ip, user_agent)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (url_hash, platform, title, duration, user_ip, user_agent))
-                request_id = cursor.lastrowid
-                conn.commit()
+            platform_id = self._lookup_id('platforms', platform)
+            with self._write() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    inserted = conn.execute(
+                        SQL_INSERT_REQUEST, (url_hash, platform_id, title, duration, user_ip, user_agent)
+                    )
+                    request_id = inserted.fetchone()[0] if HAS_RETURNING else inserted.lastrowid
+                    conn.execute(SQL_BUMP_REQUESTS)
+                    conn.execute(SQL_BUMP_PLATFORM, (platform,))
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
                 return request_id
         except Exception as e:
             app_logger.error(f"Failed to log video request: {str(e)}")
@@ -114,95 +454,137 @@ class DatabaseManager:
                            processing_time_ms: int = None):
         """Update video request status"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE video_requests 
-                    SET status = ?, error_message = ?, processing_time_ms = ?, 
-                        completed_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                ''', (status, error_message, processing_time_ms, request_id))
-                conn.commit()
+            with self._write() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    previous = conn.execute(
+                        'SELECT status, processing_time_ms FROM video_requests WHERE id = ?', (request_id,)
+                    ).fetchone()
+                    conn.execute(SQL_UPDATE_REQUEST, (status, error_message, processing_time_ms, request_id))
+                    
+                    if previous is not None:
+                        old_time = previous['processing_time_ms']
+                        conn.execute(SQL_ADJUST_COMPLETION, (
+                            (status == 'completed') - (previous['status'] == 'completed'),
+                            (processing_time_ms or 0) - (old_time or 0),
+                            (processing_time_ms is not None) - (old_time is not None)
+                        ))
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
         except Exception as e:
             app_logger.error(f"Failed to update video request: {str(e)}")
     
     def log_extracted_frame(self, request_id: int, timestamp: int, filename: str, file_size: int = None):
-        """Log an extracted frame"""
+        """Queue an extracted frame for the next batched write"""
+        self._pending.put((SQL_INSERT_FRAME, (request_id, timestamp, filename, file_size)))
+    
+    def log_extracted_frames(self, request_id: int, frames: Sequence[Tuple[int, str, int]]) -> int:
+        """Log all frames of a request, given as (timestamp, filename, file_size), in one transaction"""
+        rows = [(request_id, timestamp, filename, file_size) for timestamp, filename, file_size in frames]
+        if not rows:
+            return 0
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO extracted_frames (request_id, timestamp, filename, file_size)
-                    VALUES (?, ?, ?, ?)
-                ''', (request_id, timestamp, filename, file_size))
-                conn.commit()
+            with self._write() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    conn.executemany(SQL_INSERT_FRAME, rows)
+                    conn.execute(SQL_ADD_FRAMES, (len(rows),))
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+                return len(rows)
         except Exception as e:
-            app_logger.error(f"Failed to log extracted frame: {str(e)}")
+            app_logger.error(f"Failed to log extracted frames: {str(e)}")
+            return 0
     
     def log_user_analytics(self, user_ip: str, platform: str, action: str, 
                           success: bool, response_time_ms: int = None):
-        """Log user analytics data"""
+        """Queue user analytics data for the next batched write"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO user_analytics (user_ip, platform, action, success, response_time_ms)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (user_ip, platform, action, success, response_time_ms))
-                conn.commit()
+            platform_id = self._lookup_id('platforms', platform)
+            action_id = self._lookup_id('actions', action)
         except Exception as e:
             app_logger.error(f"Failed to log user analytics: {str(e)}")
+            return
+        self._pending.put((SQL_INSERT_ANALYTICS, (user_ip, platform_id, action_id, success, response_time_ms)))
     
     def record_system_metric(self, metric_name: str, metric_value: float, metadata: Dict = None):
-        """Record system performance metric"""
+        """Queue a system performance metric; metadata is JSON-encoded by the flush thread"""
+        self._pending.put((SQL_INSERT_METRIC, (metric_name, metric_value, metadata)))
+    
+    def create_short_job(self, job_id: str):
+        """Record a newly queued short-video job"""
+        with self._write() as conn:
+            conn.execute('INSERT INTO short_jobs (job_id) VALUES (?)', (job_id,))
+    
+    def finish_short_job(self, job_id: str, payload: Dict[str, Any], http_status: int):
+        """Store a finished job's response body and status code"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                metadata_json = json.dumps(metadata) if metadata else None
-                cursor.execute('''
-                    INSERT INTO system_stats (metric_name, metric_value, metadata)
-                    VALUES (?, ?, ?)
-                ''', (metric_name, metric_value, metadata_json))
-                conn.commit()
+            with self._write() as conn:
+                conn.execute(
+                    'UPDATE short_jobs SET status = ?, http_status = ?, payload = ? WHERE job_id = ?',
+                    ('completed' if http_status == 200 else 'failed', http_status, json.dumps(payload), job_id)
+                )
         except Exception as e:
-            app_logger.error(f"Failed to record system metric: {str(e)}")
+            app_logger.error(f"Failed to store short job {job_id}: {str(e)}")
+    
+    def get_short_job(self, job_id: str, max_age_seconds: int) -> Optional[Dict[str, Any]]:
+        """Fetch a job younger than max_age_seconds, or None"""
+        with self._read() as conn:
+            row = conn.execute('''
+                SELECT status, http_status, payload,
+                       CAST(strftime('%s', 'now') - strftime('%s', created_at) AS INTEGER) AS age_seconds
+                FROM short_jobs
+                WHERE job_id = ? AND created_at >= datetime('now', ?)
+            ''', (job_id, f'-{max_age_seconds} seconds')).fetchone()
+        
+        if row is None:
+            return None
+        return {
+            'status': row['status'],
+            'http_status': row['http_status'],
+            'payload': json.loads(row['payload']) if row['payload'] else None,
+            'age_seconds': row['age_seconds']
+        }
     
     def get_platform_statistics(self, days: int = 7) -> Dict[str, Any]:
         """Get platform usage statistics for the last N days"""
+        cutoff = (f'-{days} days',)
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._read() as conn:
                 cursor = conn.cursor()
                 
                 # Platform usage stats
                 cursor.execute('''
-                    SELECT platform, 
+                    SELECT p.name as platform, 
                            COUNT(*) as total_requests,
-                           SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as successful_requests,
-                           AVG(processing_time_ms) as avg_processing_time,
-                           COUNT(DISTINCT user_ip) as unique_users
-                    FROM video_requests
-                    WHERE created_at >= datetime('now', '-{} days')
-                    GROUP BY platform
+                           SUM(CASE WHEN vr.status = 'completed' THEN 1 ELSE 0 END) as successful_requests,
+                           AVG(vr.processing_time_ms) as avg_processing_time_ms,
+                           COUNT(DISTINCT vr.user_ip) as unique_users
+                    FROM video_requests vr
+                    JOIN platforms p ON p.id = vr.platform_id
+                    WHERE vr.created_at >= datetime('now', ?)
+                    GROUP BY vr.platform_id
                     ORDER BY total_requests DESC
-                '''.format(days))
+                ''', cutoff)
                 
                 platform_stats = []
-                for row in cursor.fetchall():
+                for row in cursor:
                     platform_stats.append({
-                        'platform': row[0],
-                        'total_requests': row[1],
-                        'successful_requests': row[2],
-                        'success_rate': (row[2] / row[1] * 100) if row[1] > 0 else 0,
-                        'avg_processing_time_ms': row[3] or 0,
-                        'unique_users': row[4]
+                        **dict(row),
+                        'success_rate': (row['successful_requests'] / row['total_requests'] * 100) if row['total_requests'] > 0 else 0,
+                        'avg_processing_time_ms': row['avg_processing_time_ms'] or 0
                     })
                 
                 # Total frames extracted
+                # Frames carry their own created_at, so no join back to video_requests
                 cursor.execute('''
-                    SELECT COUNT(*) FROM extracted_frames ef
-                    JOIN video_requests vr ON ef.request_id = vr.id
-                    WHERE vr.created_at >= datetime('now', '-{} days')
-                '''.format(days))
+                    SELECT COUNT(*) FROM extracted_frames
+                    WHERE created_at >= datetime('now', ?)
+                ''', cutoff)
                 
                 total_frames = cursor.fetchone()[0]
                 
@@ -219,28 +601,28 @@ class DatabaseManager:
     
     def get_error_analysis(self, days: int = 7) -> Dict[str, Any]:
         """Get error analysis for troubleshooting"""
+        cutoff = (f'-{days} days',)
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._read() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
-                    SELECT platform, error_message, COUNT(*) as error_count
-                    FROM video_requests
-                    WHERE status = 'failed' 
-                      AND created_at >= datetime('now', '-{} days')
-                      AND error_message IS NOT NULL
-                    GROUP BY platform, error_message
+                    SELECT p.name as platform,
+                           substr(vr.error_message, 1, 200) ||
+                               CASE WHEN length(vr.error_message) > 200 THEN '...' ELSE '' END AS error_message,
+                           COUNT(*) as error_count
+                    FROM video_requests vr
+                    JOIN platforms p ON p.id = vr.platform_id
+                    WHERE vr.status = 'failed' 
+                      AND vr.created_at >= datetime('now', ?)
+                      AND vr.error_message IS NOT NULL
+                    GROUP BY vr.platform_id, vr.error_message
                     ORDER BY error_count DESC
                     LIMIT 20
-                '''.format(days))
+                ''', cutoff)
                 
-                error_analysis = []
-                for row in cursor.fetchall():
-                    error_analysis.append({
-                        'platform': row[0],
-                        'error_message': row[1][:200] + '...' if len(row[1]) > 200 else row[1],
-                        'error_count': row[2]
-                    })
+                # Messages arrive already truncated to 200 characters
+                error_analysis = [dict(row) for row in cursor]
                 
                 return {
                     'period_days': days,
@@ -254,39 +636,54 @@ class DatabaseManager:
     
     def cleanup_old_records(self, days: int = 30) -> int:
         """Clean up old database records"""
+        cutoff = (f'-{days} days',)
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write() as conn:
                 cursor = conn.cursor()
                 
-                # Clean up old records
-                cursor.execute('''
-                    DELETE FROM user_analytics 
-                    WHERE created_at < datetime('now', '-{} days')
-                '''.format(days))
-                
-                cursor.execute('''
-                    DELETE FROM system_stats 
-                    WHERE recorded_at < datetime('now', '-{} days')
-                '''.format(days))
-                
-                # Clean up old video requests and associated frames
-                cursor.execute('''
-                    DELETE FROM extracted_frames 
-                    WHERE request_id IN (
-                        SELECT id FROM video_requests 
-                        WHERE created_at < datetime('now', '-{} days')
-                    )
-                '''.format(days))
-                
-                cursor.execute('''
-                    DELETE FROM video_requests 
-                    WHERE created_at < datetime('now', '-{} days')
-                '''.format(days))
+                # All the deletes share one transaction and one journal flush
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    # Clean up old records
+                    cursor.execute('''
+                        DELETE FROM user_analytics 
+                        WHERE created_at < datetime('now', ?)
+                    ''', cutoff)
+                    
+                    cursor.execute('''
+                        DELETE FROM system_stats 
+                        WHERE recorded_at < datetime('now', ?)
+                    ''', cutoff)
+                    
+                    cursor.execute('''
+                        DELETE FROM short_jobs 
+                        WHERE created_at < datetime('now', ?)
+                    ''', cutoff)
+                    
+                    # Clean up old video requests and associated frames
+                    cursor.execute('''
+                        DELETE FROM extracted_frames 
+                        WHERE request_id IN (
+                            SELECT id FROM video_requests 
+                            WHERE created_at < datetime('now', ?)
+                        )
+                    ''', cutoff)
+                    
+                    cursor.execute('''
+                        DELETE FROM video_requests 
+                        WHERE created_at < datetime('now', ?)
+                    ''', cutoff)
+                    
+                    deleted_records = cursor.rowcount
+                    
+                    # Totals describe the retained history, so recompute them after pruning
+                    self._rebuild_summary(cursor)
+                    cursor.execute('COMMIT')
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    raise
                 
-                deleted_records = cursor.rowcount
-                conn.commit()
-                
-                # Vacuum database to reclaim space
+                # Vacuum database to reclaim space (must run outside a transaction)
                 cursor.execute('VACUUM')
                 
                 return deleted_records
@@ -301,52 +698,34 @@ db_manager = DatabaseManager()
 def get_analytics() -> Dict[str, Any]:
     """Get comprehensive analytics data"""
     try:
-        with sqlite3.connect(db_manager.db_path) as conn:
+        with db_manager._read() as conn:
             cursor = conn.cursor()
             
-            # Total requests
-            cursor.execute('SELECT COUNT(*) FROM video_requests')
-            total_requests = cursor.fetchone()[0]
-            
-            # Successful requests
-            cursor.execute("SELECT COUNT(*) FROM video_requests WHERE status = 'completed'")
-            successful_requests = cursor.fetchone()[0]
+            # Running totals and the indexed 24h count in a single round trip
+            summary = cursor.execute('''
+                SELECT s.*,
+                       (SELECT COUNT(*) FROM video_requests
+                        WHERE created_at >= datetime('now', '-1 day')) AS recent_requests
+                FROM analytics_summary s
+                WHERE s.id = 1
+            ''').fetchone()
+            total_requests = summary['total_requests']
+            successful_requests = summary['successful_requests']
+            count_processing = summary['count_processing']
+            avg_processing_time = summary['sum_processing_ms'] / count_processing if count_processing else 0
             
             # Platform breakdown
-            cursor.execute('''
-                SELECT platform, COUNT(*) as count 
-                FROM video_requests 
-                GROUP BY platform 
-                ORDER BY count DESC
-            ''')
-            platform_stats = dict(cursor.fetchall())
-            
-            # Recent activity (last 24 hours)
-            cursor.execute('''
-                SELECT COUNT(*) FROM video_requests 
-                WHERE created_at >= datetime('now', '-1 day')
-            ''')
-            recent_requests = cursor.fetchone()[0]
-            
-            # Average processing time
-            cursor.execute('''
-                SELECT AVG(processing_time_ms) FROM video_requests 
-                WHERE processing_time_ms IS NOT NULL
-            ''')
-            avg_processing_time = cursor.fetchone()[0] or 0
-            
-            # Total frames extracted
-            cursor.execute('SELECT COUNT(*) FROM extracted_frames')
-            total_frames = cursor.fetchone()[0]
+            cursor.execute('SELECT platform, count FROM platform_counts ORDER BY count DESC')
+            platform_stats = dict(cursor)
             
             return {
                 'total_requests': total_requests,
                 'successful_requests': successful_requests,
                 'success_rate': (successful_requests / total_requests * 100) if total_requests > 0 else 0,
                 'platform_stats': platform_stats,
-                'recent_requests_24h': recent_requests,
+                'recent_requests_24h': summary['recent_requests'],
                 'avg_processing_time_ms': round(avg_processing_time, 2),
-                'total_frames_extracted': total_frames
+                'total_frames_extracted': summary['total_frames']
             }
             
     except Exception as e:
@@ -361,28 +740,25 @@ def get_analytics() -> Dict[str, Any]:
             'total_frames_extracted': 0
         }
 
+def iter_recent_requests(limit: int = 10) -> Iterator[Dict[str, Any]]:
+    """Yield recent video processing requests one row at a time"""
+    with db_manager._read() as conn:
+        cursor = conn.execute('''
+            SELECT p.name as platform, vr.title, vr.status, vr.created_at, vr.processing_time_ms, vr.user_ip
+            FROM video_requests vr
+            JOIN platforms p ON p.id = vr.platform_id
+            ORDER BY vr.created_at DESC 
+            LIMIT ?
+        ''', (limit,))
+        
+        # Iterating the cursor steps the statement; rows are never all materialized at once
+        for row in cursor:
+            yield {**dict(row), 'title': row['title'] or 'Unknown'}
+
 def get_recent_requests(limit: int = 10) -> list:
     """Get recent video processing requests"""
     try:
-        with sqlite3.connect(db_manager.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT platform, title, status, created_at, processing_time_ms, user_ip
-                FROM video_requests 
-                ORDER BY created_at DESC 
-                LIMIT ?
-            ''', (limit,))
-            
-            rows = cursor.fetchall()
-            return [{
-                'platform': row[0],
-                'title': row[1] or 'Unknown',
-                'status': row[2],
-                'created_at': row[3],
-                'processing_time_ms': row[4],
-                'user_ip': row[5]
-            } for row in rows]
-            
+        return list(iter_recent_requests(limit))
     except Exception as e:
         app_logger.error(f"Failed to get recent requests: {str(e)}")
         return []
@@ -132,7 +132,7 @@ WorkingDirectory=/path/to/video_frame_extractor
 Environment=PATH=/path/to/video_frame_extractor/venv/bin
 Environment=FLASK_ENV=production
 EnvironmentFile=/path/to/video_frame_extractor/.env
-ExecStart=/path/to/video_frame_extractor/venv/bin/gunicorn -w 4 -b 127.0.0.1:8000 app_enhanced:create_app()
+ExecStart=/path/to/video_frame_extractor/venv/bin/gunicorn -w 4 -k gthread --threads 8 --timeout 300 -b 127.0.0.1:8000 app_enhanced:create_app()
 Restart=always
 
 [Install]
@@ -152,6 +152,12 @@ WantedBy=multi-user.target
         proxy_set_header X-Forwarded-Proto $scheme;
     }
 
+    # Generated shorts are streamed by nginx when USE_X_ACCEL=1
+    location /_shorts_internal/ {
+        internal;
+        alias /path/to/video_frame_extractor/generated_shorts/;
+    }
+
     location /static {
         alias /path/to/video_frame_extractor/static;
         expires 1y;
@@ -198,7 +204,7 @@ def main():
     print("4. Configure SSL certificate")
     print("5. Set up monitoring and log rotation")
     print("\nTo start the application:")
-    print("   gunicorn -w 4 -b 0.0.0.0:8000 app_enhanced:create_app()")
+    print("   gunicorn -w 4 -k gthread --threads 8 --timeout 300 -b 0.0.0.0:8000 app_enhanced:create_app()")
     print("\nTo access the dashboard:")
     print("   http://your-domain.com/dashboard")
 
@@ -4,15 +4,56 @@ Provides structured logging with different levels and outputs
 """
 import logging
 import logging.handlers
-from datetime import datetime
+import os
+import atexit
+import functools
 import json
-import traceback
+import queue
+import threading
+import time
+from contextvars import ContextVar
 from typing import Optional
 import sys
 
+import orjson
+
 from config import get_config
 
-class CustomFormatter(logging.Formatter):
+# The log file is written through a 64KiB buffer, flushed at least every LOG_FLUSH_INTERVAL_SECONDS
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL_SECONDS = 0.5
+
+# Access-log line written by log_api_request
+API_ACCESS_FORMAT = "API Request: %s %s status=%d duration_ms=%.2f ip=%s ua=%r request_id=%s"
+
+# Request-scoped fields (user_ip, request_id), set once per request and attached to every record
+log_context: ContextVar[Optional[dict]] = ContextVar('log_context', default=None)
+
+def _dumps_context(context: dict) -> str:
+    """Serialize log context with orjson, falling back to json for values it rejects"""
+    try:
+        return orjson.dumps(context, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        # e.g. integers beyond 64 bits
+        return json.dumps(context, default=str)
+
+class ContextFormatter(logging.Formatter):
+    """Formatter that appends the structured context, serialized only when a record is emitted"""
+    
+    def formatMessage(self, record):
+        context = getattr(record, 'context', None)
+        request_context = getattr(record, 'request_context', None)
+        if context or request_context:
+            # Cached on the record so the file and console handlers share one encode
+            context_str = getattr(record, 'context_str', None)
+            if context_str is None:
+                if request_context:
+                    context = {**request_context, **context}
+                context_str = record.context_str = f" | Context: {_dumps_context(context)}"
+            record.message = f"{record.message}{context_str}"
+        return super().formatMessage(record)
+
+class CustomFormatter(ContextFormatter):
     """Custom formatter with color coding for console output"""
     
     COLORS = {
@@ -24,95 +65,237 @@ class CustomFormatter(logging.Formatter):
         'RESET': '\033[0m'       # Reset
     }
     
+    # Colored level names built once instead of per record
+    COLORED_LEVELS = {
+        level: f"{color}{level}\033[0m" for level, color in COLORS.items() if level != 'RESET'
+    }
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Escapes are noise in pipes and files; FORCE_COLOR=1 keeps them for captured output
+        self._use_color = os.getenv('FORCE_COLOR') == '1' or (
+            sys.stdout is not None and sys.stdout.isatty()
+        )
+    
     def format(self, record):
-        if hasattr(record, 'color') and record.color:
-            color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-            record.levelname = f"{color}{record.levelname}{self.COLORS['RESET']}"
+        if self._use_color and getattr(record, 'color', False):
+            # Restored afterwards so other handlers of the same record see the plain name
+            levelname = record.levelname
+            record.levelname = self.COLORED_LEVELS.get(levelname, levelname)
+            try:
+                return super().format(record)
+            finally:
+                record.levelname = levelname
         return super().format(record)
 
+class SamplingFilter(logging.Filter):
+    """Pass only every rate-th DEBUG record; higher levels always pass"""
+    
+    def __init__(self, rate: int):
+        super().__init__()
+        self.rate = rate
+        self._seen = 0
+    
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        self._seen += 1
+        return self._seen % self.rate == 0
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that buffers writes, flushing on WARNING+ records or on a timer
+
+    The file size is tracked in memory, so the rollover check needs no seek+tell
+    (which would also flush the buffer on every record).
+    """
+    
+    def __init__(self, *args, flush_level: int = logging.WARNING, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flush_level = flush_level
+        self._stop_flushing = threading.Event()
+        threading.Thread(target=self._flush_periodically, name='log-flush', daemon=True).start()
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=LOG_BUFFER_SIZE,
+                      encoding=self.encoding, errors=self.errors)
+        self._file_size = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def emit(self, record):
+        # Same as RotatingFileHandler.emit, but formats once, checks the tracked
+        # size instead of the file position and does not flush every record
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg) if msg.isascii() else len(msg.encode(self.encoding or 'utf-8', 'replace'))
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._file_size + size >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._file_size += size
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _flush_periodically(self):
+        while not self._stop_flushing.wait(LOG_FLUSH_INTERVAL_SECONDS):
+            self.flush()
+    
+    def close(self):
+        self._stop_flushing.set()
+        super().close()
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that passes structured records through unformatted"""
+    
+    def prepare(self, record):
+        # The stock prepare() formats and copies every record on the calling thread.
+        # StructuredLogger records (marked by the color flag) carry only immutable args,
+        # so the message, context and traceback are left for the formatter of whichever
+        # handler emits them.
+        if getattr(record, 'color', False):
+            return record
+        return super().prepare(record)
+
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """Create the shared file and console handlers behind a background QueueListener"""
+    config = get_config()
+    
+    # File handler with rotation
+    file_handler = BufferedRotatingFileHandler(
+        config.LOG_FILE,
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=5
+    )
+    file_handler.setLevel(logging.DEBUG)
+    if config.LOG_DEBUG_SAMPLE_RATE > 1:
+        # Runs before formatting, so dropped DEBUG records cost no encode or write
+        file_handler.addFilter(SamplingFilter(config.LOG_DEBUG_SAMPLE_RATE))
+    file_handler.setFormatter(ContextFormatter(config.LOG_FORMAT))
+    
+    # Console handler with colors
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(getattr(logging, config.LOG_LEVEL))
+    console_handler.setFormatter(CustomFormatter(config.LOG_FORMAT))
+    
+    listener = logging.handlers.QueueListener(
+        _log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    
+    # Flush queued records on interpreter shutdown
+    atexit.register(listener.stop)
+    return listener
+
+# Every logger enqueues records; one background thread owns the file and console I/O
+_log_queue = queue.SimpleQueue()
+_log_listener = _start_log_listener()
+
 class StructuredLogger:
     """Enhanced logger with structured output and context management"""
     
+    # Fixed attribute layout: slot descriptors instead of a per-instance __dict__
+    __slots__ = ('config', 'logger', '_min_level', '_name', '_make_record', '_handle')
+    
     def __init__(self, name: str):
         self.config = get_config()
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, self.config.LOG_LEVEL))
+        self.refresh_level()
+        
+        # Bound once so each log call skips the attribute lookups
+        self._name = self.logger.name
+        # The record factory directly: our extra keys never collide, so makeRecord's check is skipped
+        self._make_record = logging.getLogRecordFactory()
+        self._handle = self.logger.handle
         
         # Prevent duplicate handlers
         if not self.logger.handlers:
             self._setup_handlers()
     
     def _setup_handlers(self):
-        """Setup file and console handlers"""
-        # File handler with rotation
-        file_handler = logging.handlers.RotatingFileHandler(
-            self.config.LOG_FILE,
-            maxBytes=10*1024*1024,  # 10MB
-            backupCount=5
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(self.config.LOG_FORMAT)
-        file_handler.setFormatter(file_formatter)
-        
-        # Console handler with colors
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, self.config.LOG_LEVEL))
-        console_formatter = CustomFormatter(self.config.LOG_FORMAT)
-        console_handler.setFormatter(console_formatter)
-        
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        """Attach the queue handler; the shared listener does the actual writing"""
+        self.logger.addHandler(StructuredQueueHandler(_log_queue))
+    
+    def refresh_level(self):
+        """Re-read the effective level after the underlying logger's level is changed"""
+        self._min_level = self.logger.getEffectiveLevel()
     
     def _log_with_context(self, level: int, message: str, **context):
         """Log message with additional context"""
-        context_str = ""
-        if context:
-            context_str = f" | Context: {json.dumps(context, default=str)}"
+        # Suppressed levels cost one int compare; the context is only serialized by a handler's formatter
+        if level < self._min_level:
+            return
         
         # Add color to record for console output
-        record = self.logger.makeRecord(
-            self.logger.name, level, __file__, 0, 
-            f"{message}{context_str}", (), None
-        )
+        record = self._make_record(self._name, level, __file__, 0, message, (), None)
+        record.context = context
+        record.request_context = log_context.get()
         record.color = True
-        self.logger.handle(record)
+        self._handle(record)
     
     def debug(self, message: str, **context):
-        self._log_with_context(logging.DEBUG, message, **context)
+        if logging.DEBUG >= self._min_level:
+            self._log_with_context(logging.DEBUG, message, **context)
     
     def info(self, message: str, **context):
-        self._log_with_context(logging.INFO, message, **context)
+        if logging.INFO >= self._min_level:
+            self._log_with_context(logging.INFO, message, **context)
     
     def warning(self, message: str, **context):
-        self._log_with_context(logging.WARNING, message, **context)
+        if logging.WARNING >= self._min_level:
+            self._log_with_context(logging.WARNING, message, **context)
     
     def error(self, message: str, **context):
-        self._log_with_context(logging.ERROR, message, **context)
+        if logging.ERROR >= self._min_level:
+            self._log_with_context(logging.ERROR, message, **context)
     
     def critical(self, message: str, **context):
-        self._log_with_context(logging.CRITICAL, message, **context)
+        if logging.CRITICAL >= self._min_level:
+            self._log_with_context(logging.CRITICAL, message, **context)
     
     def exception(self, message: str, **context):
         """Log exception with full traceback"""
-        context['traceback'] = traceback.format_exc()
-        self.error(message, **context)
+        if logging.ERROR < self._min_level:
+            return
+        
+        # exc_info is rendered by the emitting formatter (once, cached as exc_text)
+        record = self._make_record(self._name, logging.ERROR, __file__, 0, message, (), sys.exc_info())
+        record.context = context
+        record.request_context = log_context.get()
+        record.color = True
+        self._handle(record)
     
     def log_api_request(self, method: str, endpoint: str, user_ip: str, 
                        user_agent: str, status_code: int, duration_ms: float):
         """Log API request details"""
-        self.info(
-            f"API Request: {method} {endpoint}",
-            user_ip=user_ip,
-            user_agent=user_agent,
-            status_code=status_code,
-            duration_ms=duration_ms
+        if logging.INFO < self._min_level:
+            return
+        
+        # Fixed shape, so a %-format line replaces the JSON context encode
+        request_context = log_context.get()
+        record = self._make_record(
+            self._name, logging.INFO, __file__, 0, API_ACCESS_FORMAT,
+            (method, endpoint, status_code, duration_ms, user_ip, user_agent,
+             request_context['request_id'] if request_context else '-'),
+            None
         )
+        record.color = True
+        self._handle(record)
     
     def log_video_processing(self, platform: str, url: str, action: str, 
                            status: str, duration_ms: Optional[float] = None, 
                            error: Optional[str] = None):
         """Log video processing events"""
+        level = logging.ERROR if status == 'failed' else logging.INFO
+        if level < self._min_level:
+            return
+        
         context = {
             'platform': platform,
             'url': url[:100] + '...' if len(url) > 100 else url,  # Truncate long URLs
@@ -125,7 +308,6 @@ class StructuredLogger:
         if error:
             context['error'] = error
         
-        level = logging.ERROR if status == 'failed' else logging.INFO
         self._log_with_context(level, f"Video Processing: {action}", **context)
 
 # Global logger instances
@@ -134,44 +316,64 @@ video_logger = StructuredLogger('video_processing')
 api_logger = StructuredLogger('api')
 
 def log_function_call(func):
-    """Decorator to log function calls"""
-    def wrapper(*args, **kwargs):
-        start_time = datetime.now()
+    """Decorator to log function calls
+
+    The variant is picked at decoration time from app_logger's level: with DEBUG
+    off, successful calls are not timed and only failures are logged.
+    Call app_logger.refresh_level() before decorating if the level is changed.
+    """
+    if logging.DEBUG < app_logger._min_level:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                app_logger.error(
+                    f"Function call failed: {func.__name__}",
+                    error=str(e)
+                )
+                raise
+        return wrapper
+    
+    @functools.wraps(func)
+    def timed_wrapper(*args, **kwargs):
+        start_ns = time.perf_counter_ns()
         try:
             result = func(*args, **kwargs)
-            duration = (datetime.now() - start_time).total_seconds() * 1000
             app_logger.debug(
                 f"Function call: {func.__name__}",
-                duration_ms=duration,
+                duration_ms=(time.perf_counter_ns() - start_ns) / 1e6,
                 success=True
             )
             return result
         except Exception as e:
-            duration = (datetime.now() - start_time).total_seconds() * 1000
+            duration = (time.perf_counter_ns() - start_ns) / 1e6
             app_logger.error(
                 f"Function call failed: {func.__name__}",
                 duration_ms=duration,
                 error=str(e)
             )
             raise
-    return wrapper
+    return timed_wrapper
 
 class LogContext:
     """Context manager for logging operations"""
     
+    __slots__ = ('logger', 'operation', 'context', 'start_ns')
+    
     def __init__(self, logger: StructuredLogger, operation: str, **context):
         self.logger = logger
         self.operation = operation
         self.context = context
-        self.start_time = None
+        self.start_ns = None
     
     def __enter__(self):
-        self.start_time = datetime.now()
+        self.start_ns = time.perf_counter_ns()
         self.logger.info(f"Starting: {self.operation}", **self.context)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = (datetime.now() - self.start_time).total_seconds() * 1000
+        duration = (time.perf_counter_ns() - self.start_ns) / 1e6
         
         if exc_type is None:
             self.logger.info(
@@ -2,30 +2,50 @@
 Comprehensive test suite for Video Frame Extractor
 Tests all major functionality with proper mocking
 """
+import os
 import unittest
+import shutil
 import tempfile
-from unittest.mock import Mock, patch
+import time
+import uuid
+import logging.handlers
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+from google.oauth2.credentials import Credentials
 
 # Import our modules
 from config import Config, DevelopmentConfig, ProductionConfig
 from validators import SecurityValidator
 from video_processor import EnhancedVideoFrameExtractor
 from database import DatabaseManager
+import youtube_uploader as uploader_module
+import logger as logger_module
+from logger import StructuredLogger
 
 class TestConfig(Config):
-    """Test configuration"""
+    """Test configuration (folders are created per test process in setUpModule)"""
     TESTING = True
     DEBUG = True
-    DOWNLOAD_FOLDER = tempfile.mkdtemp()
-    FRAMES_FOLDER = tempfile.mkdtemp()
-    SHORTS_FOLDER = tempfile.mkdtemp()
-    LOGS_FOLDER = tempfile.mkdtemp()
+
+_temp_root = None
+
+def setUpModule():
+    """Give each test process its own scratch folders instead of creating them at import"""
+    global _temp_root
+    _temp_root = tempfile.mkdtemp()
+    for folder in ('DOWNLOAD_FOLDER', 'FRAMES_FOLDER', 'SHORTS_FOLDER', 'LOGS_FOLDER'):
+        setattr(TestConfig, folder, tempfile.mkdtemp(dir=_temp_root))
+
+def tearDownModule():
+    shutil.rmtree(_temp_root, ignore_errors=True)
 
 class TestSecurityValidator(unittest.TestCase):
     """Test security validator functionality"""
     
-    def setUp(self):
-        self.validator = SecurityValidator()
+    @classmethod
+    def setUpClass(cls):
+        cls.validator = SecurityValidator()
     
     def test_validate_youtube_url(self):
         """Test YouTube URL validation"""
@@ -48,7 +68,8 @@ class TestSecurityValidator(unittest.TestCase):
             'http://example.com',
             'https://unsupported-site.com/video/123',
             'javascript:alert(1)',
-            'file:///etc/passwd'
+            'file:///etc/passwd',
+            'https://youtube.com.evil.example/watch?v=dQw4w9WgXcQ'
         ]
         
         for url in invalid_urls:
@@ -56,6 +77,13 @@ class TestSecurityValidator(unittest.TestCase):
             self.assertFalse(is_valid)
             self.assertIsNotNone(error)
     
+    def test_validate_url_id_bounds(self):
+        """Test IDs must end at a boundary and stay within the bounded length"""
+        self.assertTrue(self.validator.validate_url('https://youtu.be/dQw4w9WgXcQ?t=30')[0])
+        self.assertTrue(self.validator.validate_url('https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=1s')[0])
+        self.assertFalse(self.validator.validate_url('https://youtu.be/' + 'a' * 100)[0])
+        self.assertFalse(self.validator.validate_url('https://www.douyin.com/video/123abc')[0])
+    
     def test_validate_timestamps(self):
         """Test timestamp validation"""
         valid_timestamps = ['30', '1:23', '1:23:45']
@@ -73,6 +101,14 @@ class TestSecurityValidator(unittest.TestCase):
         self.assertFalse(is_valid)
         self.assertGreater(len(errors), 0)
     
+    def test_timestamp_fields_below_60(self):
+        """Test minute and second fields of 60 or more are rejected"""
+        for timestamp in ('1:60', '1:99', '1:60:00', '0:00:75'):
+            is_valid, error, seconds = self.validator.validate_timestamp(timestamp)
+            self.assertFalse(is_valid)
+            self.assertIsNone(seconds)
+        self.assertEqual(self.validator.validate_timestamp('0:59:59'), (True, None, 3599))
+    
     def test_sanitize_filename(self):
         """Test filename sanitization"""
         dangerous_filename = 'test<>:"/\\|?*.txt'
@@ -98,23 +134,34 @@ class TestSecurityValidator(unittest.TestCase):
         self.assertFalse(is_allowed)
         self.assertEqual(remaining, 0)
 
+    def test_rate_limit_store_is_bounded(self):
+        """Test least recently seen identifiers are evicted past the cap"""
+        validator = SecurityValidator()
+        with patch.object(SecurityValidator, 'RATE_LIMIT_MAX_IDENTIFIERS', 2):
+            for identifier in ('a', 'b', 'a', 'c'):
+                validator.check_rate_limit(identifier, 5)
+        
+        self.assertEqual(list(validator._rate_limit_cache), ['a', 'c'])
+        self.assertEqual(len(validator._rate_limit_cache['a']), 2)
+
 class TestVideoProcessor(unittest.TestCase):
     """Test video processing functionality"""
     
-    def setUp(self):
-        self.extractor = EnhancedVideoFrameExtractor()
+    @classmethod
+    def setUpClass(cls):
+        cls.extractor = EnhancedVideoFrameExtractor()
+    
+    PLATFORM_CASES = (
+        ('https://www.youtube.com/watch?v=test', 'youtube'),
+        ('https://www.tiktok.com/@user/video/123', 'tiktok'),
+        ('https://www.instagram.com/p/test/', 'instagram'),
+        ('https://www.facebook.com/user/videos/123', 'facebook'),
+        ('https://www.douyin.com/video/123', 'douyin')
+    )
     
     def test_platform_detection(self):
         """Test platform detection"""
-        test_cases = [
-            ('https://www.youtube.com/watch?v=test', 'youtube'),
-            ('https://www.tiktok.com/@user/video/123', 'tiktok'),
-            ('https://www.instagram.com/p/test/', 'instagram'),
-            ('https://www.facebook.com/user/videos/123', 'facebook'),
-            ('https://www.douyin.com/video/123', 'douyin')
-        ]
-        
-        for url, expected_platform in test_cases:
+        for url, expected_platform in self.PLATFORM_CASES:
             platform = self.extractor.get_platform_from_url(url)
             self.assertEqual(platform, expected_platform)
     
@@ -134,7 +181,7 @@ class TestVideoProcessor(unittest.TestCase):
         
         mock_instance = Mock()
         mock_instance.extract_info.return_value = mock_info
-        mock_ytdl.return_value.__enter__.return_value = mock_instance
+        mock_ytdl.return_value = mock_instance
         
         url = 'https://www.youtube.com/watch?v=test'
         success, video_info, error = self.extractor.get_video_info(url)
@@ -144,11 +191,113 @@ class TestVideoProcessor(unittest.TestCase):
         self.assertEqual(video_info['duration'], 120)
         self.assertIsNone(error)
 
+    @patch('video_processor.yt_dlp.YoutubeDL')
+    def test_video_info_reuses_ydl(self, mock_ytdl):
+        """Test repeated info lookups on one thread share a YoutubeDL instance"""
+        mock_ytdl.return_value.extract_info.return_value = {'title': 'Test Video', 'duration': 60}
+        extractor = EnhancedVideoFrameExtractor()
+        
+        for url in ('https://www.youtube.com/watch?v=test', 'https://www.youtube.com/watch?v=other'):
+            success, _, _ = extractor.get_video_info(url)
+            self.assertTrue(success)
+        self.assertEqual(mock_ytdl.call_count, 1)
+    
+    @patch('video_processor.yt_dlp.YoutubeDL')
+    def test_video_info_cached(self, mock_ytdl):
+        """Test repeated lookups of a URL are served from the info cache"""
+        mock_ytdl.return_value.extract_info.return_value = {'title': 'Test Video', 'duration': 60}
+        extractor = EnhancedVideoFrameExtractor()
+        url = 'https://www.youtube.com/watch?v=test'
+        
+        first = extractor.get_video_info(url)
+        self.assertEqual(extractor.get_video_info(url), first)
+        self.assertEqual(mock_ytdl.return_value.extract_info.call_count, 1)
+        
+        extractor.clear_info_cache()
+        extractor.get_video_info(url)
+        self.assertEqual(mock_ytdl.return_value.extract_info.call_count, 2)
+
+    @patch('validators.SecurityValidator.validate_file_path', return_value=(True, ''))
+    def test_batch_frames_match_single_seeks(self, _):
+        """Test one forward pass yields the same frames as separate seeks, in input order"""
+        import cv2
+        import numpy as np
+        folder = tempfile.mkdtemp(dir=_temp_root)
+        video_path = os.path.join(folder, 'video.avi')
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (32, 32))
+        for i in range(60):
+            writer.write(np.full((32, 32, 3), i * 4, np.uint8))
+        writer.release()
+        
+        timestamps = [4, 1, 2, 2, 30]
+        batch = [(ts, os.path.join(folder, f'batch_{i}.png')) for i, ts in enumerate(timestamps)]
+        results = self.extractor.extract_frames_at_timestamps(video_path, batch)
+        
+        self.assertEqual([ok for ok, _ in results], [True, True, True, True, False])
+        for timestamp, frame_path in batch[:4]:
+            single_path = os.path.join(folder, 'single.png')
+            self.assertEqual(self.extractor.extract_frame_at_timestamp(video_path, timestamp, single_path), (True, None))
+            self.assertTrue(np.array_equal(cv2.imread(frame_path), cv2.imread(single_path)))
+    
+    def test_download_many_keeps_order(self):
+        """Test concurrent downloads return one result per URL in input order"""
+        urls = [f'https://www.youtube.com/watch?v=test{i}' for i in range(5)]
+        with patch.object(self.extractor, 'download_video', side_effect=lambda url: (url, 'title', None)):
+            results = self.extractor.download_many(urls, max_workers=3)
+        
+        self.assertEqual([result[0] for result in results], urls)
+        self.assertEqual(self.extractor.download_many([]), [])
+    
+    def test_cleanup_old_files(self):
+        """Test only files older than the cutoff are deleted"""
+        extractor = EnhancedVideoFrameExtractor()
+        folder = Path(tempfile.mkdtemp(dir=_temp_root))
+        extractor.config = MagicMock(DOWNLOAD_FOLDER=folder, FRAMES_FOLDER=folder / 'missing',
+                                     SHORTS_FOLDER=folder / 'missing')
+        old_file, new_file = folder / 'old.mp4', folder / 'new.mp4'
+        old_file.write_bytes(b'x' * 10)
+        new_file.write_bytes(b'x' * 10)
+        two_days_ago = time.time() - 48 * 3600
+        os.utime(old_file, (two_days_ago, two_days_ago))
+        
+        files_deleted, _, errors = extractor.cleanup_old_files(max_age_hours=24)
+        
+        self.assertEqual((files_deleted, errors), (1, []))
+        self.assertFalse(old_file.exists())
+        self.assertTrue(new_file.exists())
+    
+    def test_cookie_browsers_without_profile_skipped(self):
+        """Test browsers without a local profile directory are not tried for cookies"""
+        import video_processor
+        profile_dir = tempfile.mkdtemp(dir=_temp_root)
+        profile_dirs = {'chrome': [profile_dir], 'firefox': [os.path.join(profile_dir, 'missing')]}
+        processor = video_processor.InstagramProcessor()
+        processor.cookie_sources = ['chrome', 'firefox', 'opera']
+        
+        with patch.dict(video_processor._BROWSER_PROFILE_DIRS, profile_dirs, clear=True), \
+                patch.object(processor, '_attempt_download', return_value=(None, 'failed')) as attempt:
+            processor.try_with_cookies('https://www.instagram.com/p/test/', {})
+        
+        tried = [call.args[1].get('cookiesfrombrowser') for call in attempt.call_args_list]
+        self.assertEqual(tried, [('chrome',), ('opera',), None])
+
+    def test_download_options_leave_base_unchanged(self):
+        """Test yt-dlp filling in the layered options never touches base_opts"""
+        import copy
+        import yt_dlp
+        import video_processor
+        for processor in (video_processor.YouTubeProcessor(), video_processor.InstagramProcessor()):
+            base_before = copy.deepcopy(processor.base_opts)
+            yt_dlp.YoutubeDL(processor.get_download_options('https://example.com/v'))
+            self.assertEqual(processor.base_opts, base_before)
+
 class TestDatabaseManager(unittest.TestCase):
     """Test database functionality"""
     
-    def setUp(self):
-        self.db_manager = DatabaseManager()
+    @classmethod
+    def setUpClass(cls):
+        # Each manager opens its connection pool and starts a flush thread; share one
+        cls.db_manager = DatabaseManager()
     
     def test_log_video_request(self):
         """Test video request logging"""
@@ -163,6 +312,14 @@ class TestDatabaseManager(unittest.TestCase):
         
         self.assertGreater(request_id, 0)
     
+    def test_log_extracted_frames(self):
+        """Test bulk frame logging"""
+        request_id = self.db_manager.log_video_request(url_hash='test_hash', platform='youtube')
+        frames = [(0, 'frame_0.jpg', 1024), (5, 'frame_5.jpg', 2048)]
+        
+        self.assertEqual(self.db_manager.log_extracted_frames(request_id, frames), 2)
+        self.assertEqual(self.db_manager.log_extracted_frames(request_id, []), 0)
+    
     def test_get_platform_statistics(self):
         """Test platform statistics generation"""
         stats = self.db_manager.get_platform_statistics(days=7)
@@ -170,6 +327,242 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertIn('period_days', stats)
         self.assertIn('platform_stats', stats)
         self.assertIn('total_frames_extracted', stats)
+    
+    def test_short_job_round_trip(self):
+        """Test finished jobs keep their payload and status code"""
+        job_id = uuid.uuid4().hex
+        self.db_manager.create_short_job(job_id)
+        pending = self.db_manager.get_short_job(job_id, 60)
+        self.assertEqual(pending['status'], 'processing')
+        self.assertLess(pending['age_seconds'], 60)
+        
+        self.db_manager.finish_short_job(job_id, {'error': 'Invalid section'}, 400)
+        job = self.db_manager.get_short_job(job_id, 60)
+        
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['http_status'], 400)
+        self.assertEqual(job['payload'], {'error': 'Invalid section'})
+        self.assertIsNone(self.db_manager.get_short_job('missing', 60))
+
+class TestStructuredLogger(unittest.TestCase):
+    """Test structured logger functionality"""
+    
+    def test_background_handlers(self):
+        """Test records reach the shared handlers through the queue"""
+        logger = StructuredLogger('test_background_handlers')
+        self.assertEqual(len(logger.logger.handlers), 1)
+        self.assertIsInstance(logger.logger.handlers[0], logging.handlers.QueueHandler)
+        
+        buffer_handler = logging.handlers.BufferingHandler(capacity=10)
+        with patch.object(logger_module._log_listener, 'handlers', (buffer_handler,)):
+            logger.info("Queued message")
+            deadline = time.time() + 2
+            while not buffer_handler.buffer and time.time() < deadline:
+                time.sleep(0.01)
+        
+        self.assertEqual(len(buffer_handler.buffer), 1)
+        self.assertIn("Queued message", buffer_handler.buffer[0].getMessage())
+    
+    def test_suppressed_level_skips_context(self):
+        """Test context is not serialized for records below the logger level"""
+        logger = StructuredLogger('test_suppressed_level')
+        logger.logger.setLevel(logging.INFO)
+        logger.refresh_level()
+        context_value = MagicMock()
+        
+        logger.debug("Suppressed message", value=context_value)
+        context_value.__str__.assert_not_called()
+    
+    def test_debug_sampling_filter(self):
+        """Test only every Nth DEBUG record passes the sampling filter"""
+        sampling_filter = logger_module.SamplingFilter(rate=3)
+        make_record = lambda level: logging.LogRecord('test', level, __file__, 0, 'message', (), None)
+        
+        passed = [sampling_filter.filter(make_record(logging.DEBUG)) for _ in range(6)]
+        self.assertEqual(passed, [False, False, True, False, False, True])
+        self.assertTrue(sampling_filter.filter(make_record(logging.WARNING)))
+
+    def test_console_color_requires_tty(self):
+        """Test ANSI level colors are only added for a TTY or with FORCE_COLOR=1"""
+        record = logging.LogRecord('test', logging.INFO, __file__, 0, 'message', (), None)
+        record.color = True
+        
+        with patch('sys.stdout') as stdout, patch.dict('os.environ', {'FORCE_COLOR': ''}):
+            stdout.isatty.return_value = False
+            self.assertNotIn('\033[', logger_module.CustomFormatter('%(levelname)s').format(record))
+            stdout.isatty.return_value = True
+            self.assertIn('\033[', logger_module.CustomFormatter('%(levelname)s').format(record))
+        
+        with patch('sys.stdout') as stdout, patch.dict('os.environ', {'FORCE_COLOR': '1'}):
+            stdout.isatty.return_value = False
+            self.assertIn('\033[', logger_module.CustomFormatter('%(levelname)s').format(record))
+        self.assertEqual(record.levelname, 'INFO')
+
+class TestYouTubeUploader(unittest.TestCase):
+    """Test YouTube uploader authentication"""
+    
+    def setUp(self):
+        uploader_module.YouTubeUploader._service_cache.clear()
+        self.addCleanup(uploader_module.YouTubeUploader._service_cache.clear)
+    
+    def _credentials(self, expires_in: timedelta) -> Credentials:
+        return Credentials(token='token', refresh_token='refresh', token_uri='https://oauth2.example/token',
+                           client_id='id', client_secret='secret',
+                           expiry=datetime.now(timezone.utc).replace(tzinfo=None) + expires_in)
+    
+    @patch('googleapiclient.discovery.build')
+    def test_authenticated_service_shared(self, mock_build):
+        """Test uploaders for one secrets file load credentials and build the service once"""
+        credentials = self._credentials(timedelta(hours=1))
+        with patch.object(uploader_module.YouTubeUploader, '_load_credentials', return_value=credentials) as load, \
+                patch.object(Credentials, 'refresh') as refresh:
+            for _ in range(2):
+                uploader = uploader_module.YouTubeUploader('secrets.json')
+                self.assertEqual(uploader.authenticate(), (True, 'Authentication successful'))
+                self.assertIs(uploader.youtube_service, mock_build.return_value)
+        
+        self.assertEqual((load.call_count, mock_build.call_count, refresh.call_count), (1, 1, 0))
+    
+    @patch('googleapiclient.discovery.build')
+    def test_token_refreshed_near_expiry(self, mock_build):
+        """Test a token about to expire is refreshed and saved"""
+        credentials = self._credentials(timedelta(minutes=1))
+        
+        def refresh(request):
+            credentials.token = 'new-token'
+        
+        with patch.object(uploader_module.YouTubeUploader, '_load_credentials', return_value=credentials), \
+                patch.object(uploader_module.YouTubeUploader, '_save_credentials') as save, \
+                patch.object(Credentials, 'refresh', side_effect=refresh):
+            self.assertTrue(uploader_module.YouTubeUploader('secrets.json').authenticate()[0])
+        
+        save.assert_called_once_with(credentials)
+
+    def test_pickled_credentials_migrated_to_json(self):
+        """Test legacy pickled credentials are loaded once and rewritten as JSON"""
+        import pickle
+        folder = tempfile.mkdtemp(dir=_temp_root)
+        uploader = uploader_module.YouTubeUploader('secrets.json')
+        uploader.credentials_file = os.path.join(folder, 'credentials.json')
+        uploader.legacy_credentials_file = os.path.join(folder, 'credentials.pickle')
+        with open(uploader.legacy_credentials_file, 'wb') as f:
+            pickle.dump(self._credentials(timedelta(hours=1)), f)
+        
+        self.assertEqual(uploader._load_credentials().token, 'token')
+        self.assertTrue(os.path.exists(uploader.credentials_file))
+        
+        os.remove(uploader.legacy_credentials_file)
+        credentials = uploader._load_credentials()
+        self.assertEqual((credentials.token, credentials.refresh_token), ('token', 'refresh'))
+
+    @patch('youtube_uploader.subprocess.run')
+    def test_validate_short_video_with_ffprobe(self, mock_run):
+        """Test Shorts validation reads stream properties from ffprobe's JSON"""
+        mock_run.return_value = Mock(stdout='{"streams": [{"width": 1080, "height": 1920, '
+                                            '"r_frame_rate": "30/1", "nb_frames": "900"}]}')
+        uploader = uploader_module.YouTubeUploader('secrets.json')
+        
+        self.assertEqual(uploader.validate_short_video('short.mp4', size_hint=1024),
+                         (True, 'Valid YouTube Short: 30.0s, 1080x1920'))
+    
+    def test_validate_short_video_without_ffprobe(self):
+        """Test Shorts validation falls back to OpenCV when ffprobe is missing"""
+        import cv2
+        import numpy as np
+        video_path = os.path.join(tempfile.mkdtemp(dir=_temp_root), 'short.avi')
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (32, 64))
+        for _ in range(20):
+            writer.write(np.zeros((64, 32, 3), np.uint8))
+        writer.release()
+        uploader = uploader_module.YouTubeUploader('secrets.json')
+        
+        with patch('youtube_uploader.subprocess.run', side_effect=FileNotFoundError):
+            self.assertEqual(uploader.validate_short_video(video_path),
+                             (True, 'Valid YouTube Short: 2.0s, 32x64'))
+
+    def test_upload_videos_batch_keeps_order(self):
+        """Test batch uploads return one result per job in input order"""
+        uploader = uploader_module.YouTubeUploader('secrets.json')
+        uploader.youtube_service = MagicMock()
+        jobs = [{'video_path': f'short_{i}.mp4', 'title': f'Short {i}'} for i in range(4)]
+        
+        with patch.object(uploader, 'upload_video', side_effect=lambda video_path, title: (True, title, video_path)):
+            results = uploader.upload_videos_batch(jobs, concurrency=2)
+        
+        self.assertEqual([result[1] for result in results], [job['title'] for job in jobs])
+        self.assertEqual(uploader.upload_videos_batch([]), [])
+
+    @patch('youtube_uploader.time.sleep')
+    def test_upload_retry_honors_retry_after(self, mock_sleep):
+        """Test rate-limited chunks are retried no sooner than the server's Retry-After"""
+        from googleapiclient.errors import HttpError
+        import httplib2
+        rate_limited = HttpError(httplib2.Response({'status': 429, 'retry-after': '30'}), b'')
+        insert_request = Mock()
+        insert_request.next_chunk.side_effect = [rate_limited, (None, {'id': 'abc123'})]
+        
+        self.assertEqual(uploader_module.YouTubeUploader('secrets.json')._resumable_upload(insert_request), 'abc123')
+        self.assertGreaterEqual(mock_sleep.call_args.args[0], 30)
+
+    def test_upload_resumes_saved_session(self):
+        """Test a saved upload session resumes at the offset the server committed"""
+        import httplib2
+        from googleapiclient.http import MediaUploadProgress
+        video_path = os.path.join(tempfile.mkdtemp(dir=_temp_root), 'short.mp4')
+        Path(video_path).write_bytes(b'x' * 1000)
+        uploader = uploader_module.YouTubeUploader('secrets.json')
+        uploader.upload_sessions_dir = tempfile.mkdtemp(dir=_temp_root)
+        fingerprint = uploader._upload_fingerprint(video_path, os.stat(video_path), {'snippet': {}})
+        manifest_path = uploader._upload_manifest_path(fingerprint)
+        self.assertNotEqual(os.path.dirname(manifest_path), os.path.dirname(video_path))
+        
+        interrupted = Mock(resumable_uri='https://upload.example/session', resumable_progress=400)
+        interrupted.next_chunk.side_effect = [(MediaUploadProgress(400, 1000), None), ConnectionError('reset')]
+        progress = []
+        with patch.object(uploader_module.YouTubeUploader, 'MAX_UPLOAD_RETRIES', 0):
+            self.assertIsNone(uploader._resumable_upload(interrupted, manifest_path, fingerprint,
+                                                         lambda *args: progress.append(args)))
+        self.assertEqual(progress, [(400, 1000)])
+        
+        resumed = Mock(resumable_uri=None, resumable_progress=0)
+        resumed.http.request.return_value = (httplib2.Response({'status': 308, 'range': 'bytes=0-511'}), b'')
+        self.assertIsNone(uploader._resume_existing(resumed, manifest_path, fingerprint, 1000))
+        self.assertEqual((resumed.resumable_uri, resumed.resumable_progress), ('https://upload.example/session', 512))
+        
+        resumed.next_chunk.return_value = (None, {'id': 'abc123'})
+        self.assertEqual(uploader._resumable_upload(resumed, manifest_path, fingerprint), 'abc123')
+        self.assertFalse(os.path.exists(manifest_path))
+    
+    def test_unreachable_saved_session_starts_fresh(self):
+        """Test a transport error while querying a saved session drops the manifest"""
+        uploader = uploader_module.YouTubeUploader('secrets.json')
+        uploader.upload_sessions_dir = tempfile.mkdtemp(dir=_temp_root)
+        manifest_path = uploader._upload_manifest_path('abc')
+        Path(manifest_path).write_text('{"uri": "https://upload.example/session", "fingerprint": "abc"}')
+        
+        request = Mock(resumable_uri=None, resumable_progress=0)
+        request.http.request.side_effect = ConnectionError('reset')
+        self.assertIsNone(uploader._resume_existing(request, manifest_path, 'abc', 1000))
+        self.assertIsNone(request.resumable_uri)
+        self.assertFalse(os.path.exists(manifest_path))
+
+    def test_description_trimmed_to_byte_limit(self):
+        """Test descriptions are cut to 5000 UTF-8 bytes without splitting characters"""
+        uploader = uploader_module.YouTubeUploader('secrets.json')
+        body = uploader._build_body('Title', '🎬' * 2000, None, '22', 'private', is_short=False)
+        
+        self.assertEqual(body['snippet']['description'], '🎬' * 1250)
+        self.assertEqual(uploader_module._truncate_utf8('héllo', 2), 'h')
+
+    def test_tags_deduplicated_within_total_length(self):
+        """Test tags are de-duplicated and cut to YouTube's 500-character total"""
+        uploader = uploader_module.YouTubeUploader('secrets.json')
+        
+        self.assertEqual(uploader._normalize_tags([' Shorts', 'shorts', 'AI', '', 'two words']),
+                         ['Shorts', 'AI', 'two words'])
+        tags = uploader._normalize_tags([f'{i}' * 99 for i in range(10)])
+        self.assertEqual(len(tags), 5)
+        self.assertLessEqual(len(','.join(tags)), uploader.TAGS_MAX_TOTAL_LENGTH)
 
 class TestConfiguration(unittest.TestCase):
     """Test configuration management"""
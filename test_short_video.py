@@ -1,5 +1,6 @@
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 # Test the new short video creation feature
 def test_create_short():
@@ -20,37 +21,46 @@ def test_create_short():
         }
     }
     
+    # Output is collected and printed at once so it does not interleave with the other check
+    lines = []
     try:
         response = requests.post(url, json=data, timeout=300)  # 5 minute timeout
-        print(f"Status Code: {response.status_code}")
+        lines.append(f"Status Code: {response.status_code}")
         result = response.json()
-        print(f"Response: {json.dumps(result, indent=2)}")
+        lines.append(f"Response: {json.dumps(result, indent=2)}")
         
         if result.get('success'):
-            print("✅ Short video created successfully!")
+            lines.append("✅ Short video created successfully!")
             filename = result['short_video']['filename']
-            print(f"📹 Video file: {filename}")
-            print(f"🔗 Access at: http://127.0.0.1:5000/shorts/{filename}")
+            lines.append(f"📹 Video file: {filename}")
+            lines.append(f"🔗 Access at: http://127.0.0.1:5000/shorts/{filename}")
         else:
-            print("❌ Failed to create short video")
+            lines.append("❌ Failed to create short video")
             
     except Exception as e:
-        print(f"❌ Error: {e}")
+        lines.append(f"❌ Error: {e}")
+    finally:
+        print("\n".join(lines))
 
 def test_video_info():
     url = "http://127.0.0.1:5000/api/video-info"
     data = {"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"}
     
+    lines = []
     try:
         response = requests.post(url, json=data)
-        print(f"\\nVideo Info Status Code: {response.status_code}")
+        lines.append(f"\\nVideo Info Status Code: {response.status_code}")
         result = response.json()
-        print(f"Video Info Response: {json.dumps(result, indent=2)}")
+        lines.append(f"Video Info Response: {json.dumps(result, indent=2)}")
         
     except Exception as e:
-        print(f"❌ Video Info Error: {e}")
+        lines.append(f"❌ Video Info Error: {e}")
+    finally:
+        print("\n".join(lines))
 
 if __name__ == "__main__":
     print("🧪 Testing Short Video Creator...")
-    test_video_info()
-    test_create_short()
+    # The checks are independent; run them side by side so the suite takes as long as the slowest
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for future in [executor.submit(test_video_info), executor.submit(test_create_short)]:
+            future.result()
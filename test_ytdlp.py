@@ -7,14 +7,15 @@ urls = [
     'https://www.youtube.com/watch?v=dQw4w9WgXcQ'  # Rick Roll - a stable test video
 ]
 
-for url in urls:
-    try:
-        ydl_opts = {
-            'format': 'best[height<=720]',
-            'noplaylist': True,
-        }
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+ydl_opts = {
+    'format': 'best[height<=720]',
+    'noplaylist': True,
+}
+
+# One YoutubeDL for all URLs: option parsing and extractor setup happen once
+with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    for url in urls:
+        try:
             print(f"\nTesting URL: {url}")
             info = ydl.extract_info(url, download=False)
             
@@ -26,8 +27,8 @@ for url in urls:
                 print("✅ Success")
             else:
                 print(f"❌ Info is not a dict. Content: {str(info)[:200]}...")
-                
-    except Exception as e:
-        print(f"❌ Error with {url}: {e}")
-        import traceback
-        traceback.print_exc()
+                    
+        except Exception as e:
+            print(f"❌ Error with {url}: {e}")
+            import traceback
+            traceback.print_exc()
@@ -5,11 +5,14 @@ Provides comprehensive input validation, sanitization, and security checks
 import re
 import urllib.parse as urlparse
 from typing import List, Tuple, Optional
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict, deque
 import hashlib
+from functools import lru_cache, partial
 from pathlib import Path
+from types import MappingProxyType
 
-from config import get_config
+from config import Config, get_config
 from logger import app_logger
 
 class ValidationError(Exception):
@@ -19,40 +22,110 @@ class ValidationError(Exception):
 class SecurityValidator:
     """Comprehensive input validation and security checks"""
     
+    # Per-instance state only; the pattern tables below are shared class constants
+    __slots__ = (
+        'config', '_rate_limit_cache', '_validate_url_cached', '_max_duration', '_rate_limit',
+        '_supported_platforms_str', '_platform_host_fullmatch', '_base_resolved'
+    )
+    
+    # URL validation patterns (matched from the start of the URL). Repeats are
+    # bounded and each ID must end at a non-ID character, so a crafted URL
+    # cannot make the engine backtrack far or pass on a prefix of an overlong ID
+    url_patterns = MappingProxyType({
+        'youtube': (
+            r'https?://(?:www\.|m\.)?youtube\.com/watch\?v=[\w-]{1,64}(?![\w-])',
+            r'https?://youtu\.be/[\w-]{1,64}(?![\w-])'
+        ),
+        'tiktok': (
+            r'https?://(?:www\.)?tiktok\.com/@[\w.-]{1,64}/video/\d{1,32}(?!\w)',
+            r'https?://vm\.tiktok\.com/[\w-]{1,64}(?![\w-])',
+            r'https?://m\.tiktok\.com/v/\d{1,32}(?!\w)'
+        ),
+        'instagram': (
+            r'https?://(?:www\.)?instagram\.com/(?:p|reel|tv)/[\w-]{1,64}(?![\w-])',
+        ),
+        'facebook': (
+            r'https?://(?:(?:www\.|m\.)?facebook\.com|fb\.com)/\w{1,64}/videos/\d{1,32}(?!\w)',
+        ),
+        'douyin': (
+            r'https?://(?:www\.)?douyin\.com/video/\d{1,32}(?!\w)',
+            r'https?://v\.douyin\.com/[\w-]{1,64}(?![\w-])'
+        )
+    })
+    
+    # Host -> platform; subdomains resolve through their parent domain
+    _domain_to_platform = MappingProxyType({
+        domain: platform
+        for platform, domains in {
+            'youtube': ('youtube.com', 'youtu.be', 'm.youtube.com'),
+            'tiktok': ('tiktok.com', 'vm.tiktok.com', 'm.tiktok.com'),
+            'instagram': ('instagram.com', 'www.instagram.com'),
+            'facebook': ('facebook.com', 'fb.com', 'm.facebook.com', 'www.facebook.com'),
+            'douyin': ('douyin.com', 'v.douyin.com')
+        }.items()
+        for domain in domains
+    })
+    
+    # Compiled once at import and kept as bound methods, so hot paths skip both re's
+    # cache lookup and the pattern attribute lookup. URLs are lowercased before
+    # matching, so no IGNORECASE; ASCII keeps \w/\d to URL characters.
+    # All platforms share one pattern with a named group each: a single match
+    # validates the URL and its lastgroup names the platform it matched
+    _url_match = re.compile('|'.join(
+        f"(?P<{platform}>{'|'.join(patterns)})" for platform, patterns in url_patterns.items()
+    ), re.ASCII).match
+    # IP addresses (covers 127.0.0.1); the only suspicious pattern that needs a regex
+    _ip_address_search = re.compile(r'[0-9]+\.[0-9]+\.[0-9]+\.[0-9]+', re.ASCII).search
+    _collapse_dot_runs = partial(re.compile(r'\.\.+').sub, '.')
+    _strip_html_tags = partial(re.compile(r'<[^>]+>').sub, '')
+    
+    # Fixed suspicious substrings, checked with str's C-level search before any regex
+    _SUSPICIOUS_TOKENS = (
+        'bit.ly',  # URL shorteners (could hide malicious content)
+        'tinyurl',
+        'localhost',
+        '../..',  # Path traversal
+        'javascript:',
+        'data:',
+        'file:'
+    )
+    
+    # Cap on identifiers tracked by check_rate_limit, so one-off clients can't grow it forever
+    RATE_LIMIT_MAX_IDENTIFIERS = 10_000
+    
+    # Characters not allowed in filenames, all mapped to '_' in one translate pass
+    _FILENAME_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+    
+    # Characters stripped from user text, deleted in one translate pass
+    _DANGEROUS_TRANS = str.maketrans('', '', '<>"\'&')
+    
     def __init__(self):
         self.config = get_config()
         
-        # URL validation patterns
-        self.url_patterns = {
-            'youtube': [
-                r'https?://(www\.)?youtube\.com/watch\?v=[\w-]+',
-                r'https?://youtu\.be/[\w-]+',
-                r'https?://m\.youtube\.com/watch\?v=[\w-]+'
-            ],
-            'tiktok': [
-                r'https?://(www\.)?tiktok\.com/@[\w.-]+/video/\d+',
-                r'https?://vm\.tiktok\.com/[\w-]+',
-                r'https?://m\.tiktok\.com/v/\d+'
-            ],
-            'instagram': [
-                r'https?://(www\.)?instagram\.com/p/[\w-]+',
-                r'https?://(www\.)?instagram\.com/reel/[\w-]+',
-                r'https?://(www\.)?instagram\.com/tv/[\w-]+'
-            ],
-            'facebook': [
-                r'https?://(www\.)?facebook\.com/\w+/videos/\d+',
-                r'https?://fb\.com/\w+/videos/\d+',
-                r'https?://m\.facebook\.com/\w+/videos/\d+'
-            ],
-            'douyin': [
-                r'https?://(www\.)?douyin\.com/video/\d+',
-                r'https?://v\.douyin\.com/[\w-]+'
-            ]
-        }
-        
-        # Rate limiting storage (in production, use Redis/database)
-        self._rate_limit_cache = {}
+        # Rate limiting storage (in production, use Redis/database):
+        # per identifier, a deque of monotonic request times, oldest first,
+        # with identifiers kept in least-recently-seen order for eviction
+        self._rate_limit_cache = OrderedDict()
+        
+        # Validation is a pure function of the URL for a given config; repeated
+        # submissions of the same URL are served from here (reload_config clears it)
+        self._validate_url_cached = lru_cache(maxsize=4096)(self._validate_url)
         
+        self.reload_config()
+    
+    def reload_config(self, config: Optional[Config] = None):
+        """Snapshot the config values used on hot paths (call again after changing config)"""
+        if config is not None:
+            self.config = config
+        self._max_duration = self.config.MAX_VIDEO_DURATION
+        self._rate_limit = self.config.RATE_LIMIT_PER_MINUTE
+        self._supported_platforms_str = ', '.join(self.config.SUPPORTED_PLATFORMS)
+        self._platform_host_fullmatch = self.config.PLATFORM_HOST_RE.fullmatch
+        # Resolved once; validate_file_path compares every candidate against it
+        self._base_resolved = self.config.BASE_DIR.resolve()
+        # Cached results may depend on the old values
+        self._validate_url_cached.cache_clear()
+    
     def validate_url(self, url: str) -> Tuple[bool, str, Optional[str]]:
         """
         Validate URL format and detect platform
@@ -63,8 +136,10 @@ class SecurityValidator:
         if not url or not isinstance(url, str):
             return False, 'unknown', "URL is required and must be a string"
         
-        url = url.strip()
-        
+        return self._validate_url_cached(url.strip())
+    
+    def _validate_url(self, url: str) -> Tuple[bool, str, Optional[str]]:
+        """Uncached validate_url body for a stripped URL string"""
         # Basic URL format validation
         try:
             parsed = urlparse.urlparse(url)
@@ -78,68 +153,62 @@ class SecurityValidator:
             return False, 'unknown', f"URL parsing error: {str(e)}"
         
         # Check if URL is from supported platforms
-        domain = parsed.netloc.lower()
-        platform = self._detect_platform(domain)
+        platform = self._platform_for_host(parsed.hostname or '')
         
         if platform == 'unknown':
-            supported = ', '.join(self.config.SUPPORTED_PLATFORMS)
-            return False, 'unknown', f"Unsupported platform. Supported: {supported}"
+            return False, 'unknown', f"Unsupported platform. Supported: {self._supported_platforms_str}"
+        
+        # Pattern checks below run on one lowercased copy instead of case-folding per match
+        url_lower = url.lower()
         
         # Platform-specific validation
-        is_valid, error = self._validate_platform_url(url, platform)
+        is_valid, error = self._validate_platform_url(url_lower, platform)
         if not is_valid:
             return False, platform, error
         
         # Security checks
-        if self._is_suspicious_url(url):
+        if self._is_suspicious_url(url_lower):
             app_logger.warning("Suspicious URL detected", url=url)
             return False, platform, "URL appears suspicious"
         
         return True, platform, None
     
+    def _platform_for_host(self, domain: str) -> str:
+        """Platform for an allowlisted host (or subdomain of one), else 'unknown'"""
+        if self._platform_host_fullmatch(domain):
+            return self._detect_platform(domain)
+        return 'unknown'
+    
     def _detect_platform(self, domain: str) -> str:
-        """Detect platform from domain"""
-        platform_domains = {
-            'youtube': ['youtube.com', 'youtu.be', 'm.youtube.com'],
-            'tiktok': ['tiktok.com', 'vm.tiktok.com', 'm.tiktok.com'],
-            'instagram': ['instagram.com', 'www.instagram.com'],
-            'facebook': ['facebook.com', 'fb.com', 'm.facebook.com', 'www.facebook.com'],
-            'douyin': ['douyin.com', 'v.douyin.com']
-        }
-        
-        for platform, domains in platform_domains.items():
-            if any(d in domain for d in domains):
+        """Detect platform from domain (exact host, then its parent domains)"""
+        platform = self._domain_to_platform.get(domain)
+        if platform:
+            return platform
+        
+        parts = domain.split('.')
+        for i in range(1, len(parts) - 1):
+            platform = self._domain_to_platform.get('.'.join(parts[i:]))
+            if platform:
                 return platform
         return 'unknown'
     
     def _validate_platform_url(self, url: str, platform: str) -> Tuple[bool, Optional[str]]:
-        """Validate URL against platform-specific patterns"""
-        patterns = self.url_patterns.get(platform, [])
-        
-        for pattern in patterns:
-            if re.match(pattern, url, re.IGNORECASE):
-                return True, None
+        """Validate a lowercased URL against platform-specific patterns"""
+        # Hosts differ between platforms, so a match for another platform cannot hide this one's
+        match = self._url_match(url)
+        if match and match.lastgroup == platform:
+            return True, None
         
         return False, f"Invalid {platform} URL format"
     
     def _is_suspicious_url(self, url: str) -> bool:
-        """Check for suspicious URL patterns"""
-        suspicious_patterns = [
-            r'bit\.ly',  # URL shorteners (could hide malicious content)
-            r'tinyurl',
-            r'[0-9]+\.[0-9]+\.[0-9]+\.[0-9]+',  # IP addresses
-            r'localhost',
-            r'127\.0\.0\.1',
-            r'\.\./\.\.',  # Path traversal
-            r'javascript:',
-            r'data:',
-            r'file:'
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
+        """Check a lowercased URL for suspicious patterns"""
+        for token in self._SUSPICIOUS_TOKENS:
+            if token in url:
                 return True
-        return False
+        
+        # A dotted-quad needs three dots; typical platform URLs have two at most
+        return url.count('.') >= 3 and self._ip_address_search(url) is not None
     
     def validate_timestamp(self, timestamp: str) -> Tuple[bool, Optional[str], Optional[int]]:
         """
@@ -153,30 +222,23 @@ class SecurityValidator:
         if not timestamp or not isinstance(timestamp, str):
             return False, "Timestamp is required and must be a string", None
         
-        timestamp = timestamp.strip()
-        
-        # Pattern for different timestamp formats
-        patterns = [
-            (r'^(\d+)$', lambda m: int(m.group(1))),  # seconds only
-            (r'^(\d+):(\d{2})$', lambda m: int(m.group(1)) * 60 + int(m.group(2))),  # MM:SS
-            (r'^(\d+):(\d{2}):(\d{2})$', 
-             lambda m: int(m.group(1)) * 3600 + int(m.group(2)) * 60 + int(m.group(3)))  # HH:MM:SS
-        ]
-        
-        for pattern, converter in patterns:
-            match = re.match(pattern, timestamp)
-            if match:
-                try:
-                    seconds = converter(match)
-                    if seconds < 0:
-                        return False, "Timestamp cannot be negative", None
-                    if seconds > self.config.MAX_VIDEO_DURATION:
-                        return False, f"Timestamp exceeds maximum duration ({self.config.MAX_VIDEO_DURATION}s)", None
-                    return True, None, seconds
-                except ValueError as e:
-                    return False, f"Invalid timestamp format: {str(e)}", None
-        
-        return False, "Invalid timestamp format. Use: 30, 1:23, or 1:23:45", None
+        # SS, MM:SS or HH:MM:SS; every part after the first is exactly two digits
+        parts = timestamp.strip().split(':')
+        if (len(parts) > 3
+                or not all(part.isascii() and part.isdigit() for part in parts)
+                or any(len(part) != 2 for part in parts[1:])):
+            return False, "Invalid timestamp format. Use: 30, 1:23, or 1:23:45", None
+        
+        seconds = int(parts[0])
+        for part in parts[1:]:
+            value = int(part)
+            if value >= 60:
+                return False, "Minutes and seconds must be below 60", None
+            seconds = seconds * 60 + value
+        
+        if seconds > self._max_duration:
+            return False, f"Timestamp exceeds maximum duration ({self._max_duration}s)", None
+        return True, None, seconds
     
     def validate_timestamps(self, timestamps: List[str]) -> Tuple[bool, List[str], List[int]]:
         """
@@ -194,14 +256,18 @@ class SecurityValidator:
         errors = []
         valid_seconds = []
         
-        for i, timestamp in enumerate(timestamps):
-            is_valid, error, seconds = self.validate_timestamp(timestamp)
-            if not is_valid:
-                errors.append(f"Timestamp {i+1}: {error}")
+        # Bound once; the loop runs up to 50 times per request
+        validate_one = self.validate_timestamp
+        add_seconds = valid_seconds.append
+        
+        for i, timestamp in enumerate(timestamps, 1):
+            is_valid, error, seconds = validate_one(timestamp)
+            if is_valid:
+                add_seconds(seconds)
             else:
-                valid_seconds.append(seconds)
+                errors.append(f"Timestamp {i}: {error}")
         
-        return len(errors) == 0, errors, valid_seconds
+        return not errors, errors, valid_seconds
     
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize filename to prevent path traversal and invalid characters"""
@@ -209,8 +275,9 @@ class SecurityValidator:
             return "unknown"
         
         # Remove/replace dangerous characters
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        filename = re.sub(r'\.\.+', '.', filename)  # Remove multiple dots
+        filename = filename.translate(self._FILENAME_TRANS)
+        if '..' in filename:
+            filename = self._collapse_dot_runs(filename)  # Remove multiple dots
         filename = filename.strip('. ')  # Remove leading/trailing dots and spaces
         
         # Limit length
@@ -232,28 +299,31 @@ class SecurityValidator:
             (is_allowed, requests_remaining)
         """
         if max_requests is None:
-            max_requests = self.config.RATE_LIMIT_PER_MINUTE
-        
-        now = datetime.now()
-        window_start = now - timedelta(minutes=window_minutes)
-        
-        # Clean old entries
-        if identifier in self._rate_limit_cache:
-            self._rate_limit_cache[identifier] = [
-                req_time for req_time in self._rate_limit_cache[identifier]
-                if req_time > window_start
-            ]
+            max_requests = self._rate_limit
+        
+        now = time.monotonic()
+        window_start = now - window_minutes * 60
+        
+        # Least recently seen identifiers are evicted first once the store is full
+        cache = self._rate_limit_cache
+        request_times = cache.get(identifier)
+        if request_times is None:
+            request_times = cache[identifier] = deque()
+            if len(cache) > self.RATE_LIMIT_MAX_IDENTIFIERS:
+                cache.popitem(last=False)
         else:
-            self._rate_limit_cache[identifier] = []
+            cache.move_to_end(identifier)
         
-        current_requests = len(self._rate_limit_cache[identifier])
+        # Clean old entries (expired ones are always at the left end)
+        while request_times and request_times[0] <= window_start:
+            request_times.popleft()
         
-        if current_requests >= max_requests:
+        if len(request_times) >= max_requests:
             return False, 0
         
         # Add current request
-        self._rate_limit_cache[identifier].append(now)
-        return True, max_requests - current_requests - 1
+        request_times.append(now)
+        return True, max_requests - len(request_times)
     
     def validate_file_path(self, file_path: str, allowed_extensions: List[str] = None) -> Tuple[bool, str]:
         """
@@ -268,15 +338,9 @@ class SecurityValidator:
         try:
             path = Path(file_path)
             
-            # Check for path traversal
-            if '..' in str(path):
-                return False, "Path traversal not allowed"
-            
-            # Check if path is within allowed directories
-            base_dir = self.config.BASE_DIR
-            try:
-                path.resolve().relative_to(base_dir.resolve())
-            except ValueError:
+            # Check if path is within allowed directories; resolving collapses any
+            # '..' components, so this also covers path traversal
+            if not path.resolve().is_relative_to(self._base_resolved):
                 return False, "File path outside allowed directory"
             
             # Check file extension
@@ -289,17 +353,17 @@ class SecurityValidator:
             return False, f"Invalid file path: {str(e)}"
     
     def hash_sensitive_data(self, data: str) -> str:
-        """Hash sensitive data for logging"""
-        return hashlib.sha256(data.encode()).hexdigest()[:8]
+        """Hash sensitive data for logging (an 8-hex-char tag, not a security boundary)"""
+        return hashlib.blake2b(data.encode(), digest_size=4).hexdigest()
     
     def sanitize_user_input(self, text: str, max_length: int = 1000) -> str:
         """Sanitize user input text"""
         if not text:
             return ""
         
-        # Basic HTML tag removal and character filtering
-        clean_text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        clean_text = re.sub(r'[<>"\'&]', '', clean_text)  # Remove dangerous characters
+        # Basic HTML tag removal (skipped for plain text) and character filtering
+        clean_text = self._strip_html_tags(text) if '<' in text else text
+        clean_text = clean_text.translate(self._DANGEROUS_TRANS)
         
         if len(clean_text) > max_length:
             clean_text = clean_text[:max_length]
@@ -307,25 +371,10 @@ class SecurityValidator:
         return clean_text.strip()
     
     def get_platform_from_url(self, url: str) -> str:
-        """Detect platform from URL"""
+        """Detect platform from the URL's host, using the same allowlist as validate_url"""
         try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            
-            if 'tiktok.com' in domain or 'vm.tiktok.com' in domain:
-                return 'tiktok'
-            elif 'youtube.com' in domain or 'youtu.be' in domain:
-                return 'youtube'
-            elif 'facebook.com' in domain or 'fb.com' in domain:
-                return 'facebook'
-            elif 'douyin.com' in domain:
-                return 'douyin'
-            elif 'instagram.com' in domain:
-                return 'instagram'
-            else:
-                return 'unknown'
-        except Exception:
+            return self._platform_for_host(urlparse.urlparse(url.strip()).hostname or '')
+        except (AttributeError, ValueError):
             return 'unknown'
 
 # Global validator instance
@@ -2,26 +2,184 @@
 Enhanced video processing module with improved error handling and performance
 """
 import os
+import atexit
+import contextvars
+import shutil
+import subprocess
+import sys
+import threading
 import cv2
 import yt_dlp
 import uuid
-from typing import Optional, Tuple, Dict, List, Any
+from collections import ChainMap, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from functools import cached_property, lru_cache
+from moviepy.config import get_setting as get_moviepy_setting
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from moviepy.video.io.VideoFileClip import VideoFileClip
+from typing import Optional, Tuple, Dict, List, Any, MutableMapping
 from datetime import datetime, timedelta
 
 from config import get_config
 from logger import video_logger, LogContext
 from validators import validator, ValidationError
 
+# Resolved once at import and shared by the extractor and every platform processor
+_CONFIG = get_config()
+
 class VideoProcessingError(Exception):
     """Custom exception for video processing errors"""
     pass
 
+class SectionOutOfRangeError(VideoProcessingError):
+    """Requested download section starts past the end of the video"""
+    pass
+
+@lru_cache(maxsize=256)
+def _probe_duration(video_path: str, mtime_ns: int) -> Optional[float]:
+    """Read container duration; mtime_ns keys the cache to the current file version"""
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+             '-of', 'default=nw=1:nk=1', video_path],
+            capture_output=True, text=True, timeout=30
+        )
+    except FileNotFoundError:
+        # No ffprobe on PATH: moviepy's header parse (ffmpeg -i) still avoids decoding
+        return ffmpeg_parse_infos(video_path).get('duration')
+    except subprocess.TimeoutExpired:
+        return None
+    
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+# Open VideoFileClip readers keyed by (absolute path, mtime_ns). Each reader
+# owns an ffmpeg subprocess, so keep at most one per file and close on eviction.
+MAX_OPEN_CLIPS = 8
+_open_clips = OrderedDict()
+_open_clips_lock = threading.Lock()
+
+def _get_clip(video_path: str, mtime_ns: int) -> VideoFileClip:
+    """Return the shared clip for this file version, opening it on first use"""
+    key = (video_path, mtime_ns)
+    with _open_clips_lock:
+        clip = _open_clips.get(key)
+        if clip is not None:
+            _open_clips.move_to_end(key)
+            return clip
+        
+        clip = VideoFileClip(video_path)
+        _open_clips[key] = clip
+        while len(_open_clips) > MAX_OPEN_CLIPS:
+            _, evicted = _open_clips.popitem(last=False)
+            evicted.close()
+        return clip
+
+def release_clips(video_path: str = None) -> None:
+    """Close cached clips for one file, or all of them when no path is given"""
+    with _open_clips_lock:
+        keys = [key for key in _open_clips if video_path is None or key[0] == video_path]
+        for key in keys:
+            _open_clips.pop(key).close()
+
+atexit.register(release_clips)
+
+# Frame extraction steps forward with grab() over gaps up to this long; longer
+# gaps seek, which flushes the decoder and restarts from the previous keyframe
+FRAME_GRAB_FORWARD_MAX_MS = 2000
+
+# Deletions in cleanup_old_files are I/O-bound (unlink releases the GIL)
+CLEANUP_DELETE_WORKERS = 8
+
+def _scan_old_files(folder, cutoff_timestamp: float) -> List[Tuple[str, str, int]]:
+    """(path, name, size) of files in folder last modified before cutoff_timestamp"""
+    old_files = []
+    # DirEntry caches its type and stat results, so each file is stat'ed once
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file():
+                file_stat = entry.stat()
+                if file_stat.st_mtime < cutoff_timestamp:
+                    old_files.append((entry.path, entry.name, file_stat.st_size))
+    return old_files
+
+def _delete_old_file(path: str, name: str) -> Optional[str]:
+    """Delete one file found by _scan_old_files; returns an error message on failure"""
+    try:
+        release_clips(os.path.abspath(path))
+        os.unlink(path)
+    except Exception as e:
+        return f"Could not delete {name}: {str(e)}"
+    video_logger.debug(f"Deleted old file: {name}")
+    return None
+
+# Successful get_video_info results keyed by (platform, url); a preview is usually
+# followed by an extraction of the same URL within minutes
+VIDEO_INFO_CACHE_SIZE = 2000
+VIDEO_INFO_CACHE_TTL_SECONDS = 10 * 60
+
+def _download_file(ydl: yt_dlp.YoutubeDL, url: str) -> Optional[str]:
+    """Download url and return the final file path, or None if yt-dlp reported none"""
+    # yt-dlp passes the final (post-merge) path to post hooks after every successful
+    # download, so the result never depends on what else is in the download folder
+    finished = []
+    ydl.add_post_hook(finished.append)
+    ydl.download([url])
+    return finished[-1] if finished else None
+
+def _layered_options(overrides: Dict[str, Any], base: MutableMapping[str, Any]) -> ChainMap:
+    """Per-call options over base; outtmpl gets its own copy as yt-dlp fills it in place"""
+    front = dict(overrides)
+    if 'outtmpl' in base:
+        front['outtmpl'] = dict(base['outtmpl'])
+    return ChainMap(front, base)
+
+def _set_unique_outtmpl(opts: MutableMapping[str, Any], info: Dict[str, Any], folder) -> str:
+    """Point opts at a "<title>_<short uuid>" file in folder; returns the sanitized title"""
+    title = validator.sanitize_filename(info.get('title', 'unknown'))
+    opts['outtmpl'] = {'default': f'{folder}/{title}_{str(uuid.uuid4())[:8]}.%(ext)s'}
+    return title
+
+# Where each supported browser keeps its profile (and so its cookie store), per OS;
+# yt-dlp's cookiesfrombrowser fails without one, after a full extractor setup
+if sys.platform in ('win32', 'cygwin'):
+    _BROWSER_PROFILE_DIRS = {
+        'chrome': [r'%LOCALAPPDATA%\Google\Chrome\User Data'],
+        'firefox': [r'%APPDATA%\Mozilla\Firefox\Profiles'],
+        'edge': [r'%LOCALAPPDATA%\Microsoft\Edge\User Data'],
+        'safari': [],
+    }
+elif sys.platform == 'darwin':
+    _BROWSER_PROFILE_DIRS = {
+        'chrome': ['~/Library/Application Support/Google/Chrome'],
+        'firefox': ['~/Library/Application Support/Firefox/Profiles'],
+        'edge': ['~/Library/Application Support/Microsoft Edge'],
+        'safari': ['~/Library/Cookies', '~/Library/Containers/com.apple.Safari/Data/Library/Cookies'],
+    }
+else:
+    _BROWSER_PROFILE_DIRS = {
+        'chrome': ['~/.config/google-chrome', '~/snap/chromium/common/chromium'],
+        'firefox': ['~/.mozilla/firefox', '~/.config/mozilla/firefox', '~/snap/firefox/common/.mozilla/firefox'],
+        'edge': ['~/.config/microsoft-edge'],
+        'safari': [],
+    }
+
+def _has_browser_profile(browser: str) -> bool:
+    """Whether browser has a profile directory here; unknown browsers are assumed present"""
+    dirs = _BROWSER_PROFILE_DIRS.get(browser)
+    if dirs is None:
+        return True
+    return any(os.path.isdir(os.path.expanduser(os.path.expandvars(d))) for d in dirs)
+
 class PlatformProcessor:
     """Base class for platform-specific video processing"""
     
     def __init__(self, platform: str):
         self.platform = platform
-        self.config = get_config()
+        self.config = _CONFIG
         self.base_opts = self._get_base_options()
     
     def _get_base_options(self) -> Dict[str, Any]:
@@ -39,9 +197,15 @@ class PlatformProcessor:
             'writeautomaticsub': False,
         }
     
-    def get_download_options(self, url: str) -> Dict[str, Any]:
-        """Get platform-specific download options - override in subclasses"""
-        return self.base_opts.copy()
+    def get_download_options(self, url: str) -> MutableMapping[str, Any]:
+        """
+        Get platform-specific download options - override in subclasses
+        
+        Returns a ChainMap over base_opts: overrides and any keys yt-dlp or the
+        caller set land in the front layer, and the nested outtmpl dict (which
+        yt-dlp updates in place) is copied into it, so base_opts is never mutated.
+        """
+        return _layered_options({}, self.base_opts)
     
     def process_download_error(self, error: str) -> str:
         """Process platform-specific errors - override in subclasses"""
@@ -53,10 +217,8 @@ class YouTubeProcessor(PlatformProcessor):
     def __init__(self):
         super().__init__('youtube')
     
-    def get_download_options(self, url: str) -> Dict[str, Any]:
-        opts = self.base_opts.copy()
-        opts['format'] = 'best[height<=720]/best'
-        return opts
+    def get_download_options(self, url: str) -> MutableMapping[str, Any]:
+        return _layered_options({'format': 'best[height<=720]/best'}, self.base_opts)
 
 class TikTokProcessor(PlatformProcessor):
     """TikTok-specific processing"""
@@ -64,10 +226,8 @@ class TikTokProcessor(PlatformProcessor):
     def __init__(self):
         super().__init__('tiktok')
     
-    def get_download_options(self, url: str) -> Dict[str, Any]:
-        opts = self.base_opts.copy()
-        opts['format'] = 'best/h264_540p_468478/h264_540p_287260/bytevc1_540p_248040/download'
-        return opts
+    def get_download_options(self, url: str) -> MutableMapping[str, Any]:
+        return _layered_options({'format': 'best/h264_540p_468478/h264_540p_287260/bytevc1_540p_248040/download'}, self.base_opts)
     
     def process_download_error(self, error: str) -> str:
         if 'format' in error.lower():
@@ -87,19 +247,16 @@ class InstagramProcessor(PlatformProcessor):
         super().__init__('instagram')
         self.cookie_sources = self.config.COOKIE_BROWSERS
     
-    def get_download_options(self, url: str) -> Dict[str, Any]:
-        opts = self.base_opts.copy()
-        opts['format'] = 'best[height<=720]/mp4/best'
-        return opts
+    def get_download_options(self, url: str) -> MutableMapping[str, Any]:
+        return _layered_options({'format': 'best[height<=720]/mp4/best'}, self.base_opts)
     
-    def try_with_cookies(self, url: str, base_opts: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    def try_with_cookies(self, url: str, base_opts: MutableMapping[str, Any]) -> Tuple[Optional[str], Optional[str]]:
         """Try download with various cookie sources"""
         # Try manual cookie file first
         if self.config.COOKIE_FILE_PATH.exists():
             video_logger.info("Trying manual cookie file", platform=self.platform)
             try:
-                opts = base_opts.copy()
-                opts['cookiefile'] = str(self.config.COOKIE_FILE_PATH)
+                opts = _layered_options({'cookiefile': str(self.config.COOKIE_FILE_PATH)}, base_opts)
                 result = self._attempt_download(url, opts)
                 if result[0]:
                     video_logger.info("Success with manual cookie file!", platform=self.platform)
@@ -107,12 +264,11 @@ class InstagramProcessor(PlatformProcessor):
             except Exception as e:
                 video_logger.warning(f"Manual cookie failed: {str(e)}", platform=self.platform)
         
-        # Try browser cookies
-        for browser in self.cookie_sources:
+        # Try browser cookies, skipping browsers with no profile on this machine
+        for browser in filter(_has_browser_profile, self.cookie_sources):
             video_logger.info(f"Trying {browser} cookies", platform=self.platform)
             try:
-                opts = base_opts.copy()
-                opts['cookiesfrombrowser'] = (browser,)
+                opts = _layered_options({'cookiesfrombrowser': (browser,)}, base_opts)
                 result = self._attempt_download(url, opts)
                 if result[0]:
                     video_logger.info(f"Success with {browser} cookies!", platform=self.platform)
@@ -124,24 +280,18 @@ class InstagramProcessor(PlatformProcessor):
         video_logger.info("Trying without cookies", platform=self.platform)
         return self._attempt_download(url, base_opts)
     
-    def _attempt_download(self, url: str, opts: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    def _attempt_download(self, url: str, opts: MutableMapping[str, Any]) -> Tuple[Optional[str], Optional[str]]:
         """Attempt download with given options"""
         with yt_dlp.YoutubeDL(opts) as ydl:
             info = ydl.extract_info(url, download=False)
-            if not isinstance(info, dict) or not info:
+            if not info:
                 return None, "Could not extract video information"
             
-            title = validator.sanitize_filename(info.get('title', 'unknown'))
-            unique_id = str(uuid.uuid4())[:8]
-            filename = f"{title}_{unique_id}.%(ext)s"
-            opts['outtmpl'] = {'default': f'{self.config.DOWNLOAD_FOLDER}/{filename}'}
-            
-            ydl.download([url])
+            title = _set_unique_outtmpl(opts, info, self.config.DOWNLOAD_FOLDER)
             
-            # Find downloaded file
-            for file in os.listdir(self.config.DOWNLOAD_FOLDER):
-                if unique_id in file:
-                    return os.path.join(self.config.DOWNLOAD_FOLDER, file), title
+            file_path = _download_file(ydl, url)
+            if file_path:
+                return file_path, title
             
             return None, "Downloaded file not found"
     
@@ -167,10 +317,8 @@ class FacebookProcessor(PlatformProcessor):
     def __init__(self):
         super().__init__('facebook')
     
-    def get_download_options(self, url: str) -> Dict[str, Any]:
-        opts = self.base_opts.copy()
-        opts['format'] = 'best[height<=720]/best'
-        return opts
+    def get_download_options(self, url: str) -> MutableMapping[str, Any]:
+        return _layered_options({'format': 'best[height<=720]/best'}, self.base_opts)
     
     def process_download_error(self, error: str) -> str:
         if 'login' in error.lower() or 'private' in error.lower():
@@ -189,17 +337,31 @@ class DouyinProcessor(PlatformProcessor):
     def __init__(self):
         super().__init__('douyin')
     
-    def get_download_options(self, url: str) -> Dict[str, Any]:
-        opts = self.base_opts.copy()
-        opts['format'] = 'best/mp4'
-        return opts
+    def get_download_options(self, url: str) -> MutableMapping[str, Any]:
+        return _layered_options({'format': 'best/mp4'}, self.base_opts)
 
 class EnhancedVideoFrameExtractor:
     """Enhanced video processing with improved error handling and modular design"""
     
     def __init__(self):
-        self.config = get_config()
-        self.processors = {
+        self.config = _CONFIG
+        # yt-dlp only does partial (section) downloads with ffmpeg on PATH
+        self.can_download_sections = shutil.which('ffmpeg') is not None
+        # Baseline JPEG (no optimize/progressive passes) at the configured quality
+        self._jpeg_params = [
+            cv2.IMWRITE_JPEG_QUALITY, self.config.FRAME_JPEG_QUALITY,
+            cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+            cv2.IMWRITE_JPEG_PROGRESSIVE, 0
+        ]
+        # Per-thread YoutubeDL instances for info extraction (YoutubeDL is not thread-safe)
+        self._info_ydls = threading.local()
+        self._info_cache = TTLCache(maxsize=VIDEO_INFO_CACHE_SIZE, ttl=VIDEO_INFO_CACHE_TTL_SECONDS)
+        self._info_cache_lock = threading.Lock()
+    
+    @cached_property
+    def processors(self) -> Dict[str, PlatformProcessor]:
+        """Platform processors, built on first use rather than at construction"""
+        return {
             'youtube': YouTubeProcessor(),
             'tiktok': TikTokProcessor(),
             'instagram': InstagramProcessor(),
@@ -207,6 +369,26 @@ class EnhancedVideoFrameExtractor:
             'douyin': DouyinProcessor()
         }
     
+    def clear_info_cache(self) -> None:
+        """Drop all cached get_video_info results"""
+        with self._info_cache_lock:
+            self._info_cache.clear()
+    
+    def _get_info_ydl(self, platform: str, processor: PlatformProcessor, url: str) -> yt_dlp.YoutubeDL:
+        """This thread's reusable info-extraction YoutubeDL for platform"""
+        # Reusing one instance keeps its opener, cookie jar and loaded extractors
+        # instead of rebuilding them on every info lookup
+        instances = getattr(self._info_ydls, 'by_platform', None)
+        if instances is None:
+            instances = self._info_ydls.by_platform = {}
+        
+        ydl = instances.get(platform)
+        if ydl is None:
+            opts = processor.get_download_options(url)
+            opts['quiet'] = True
+            ydl = instances[platform] = yt_dlp.YoutubeDL(opts)
+        return ydl
+    
     def validate_and_process_url(self, url: str) -> Tuple[bool, str, Optional[str]]:
         """Validate URL and detect platform"""
         with LogContext(video_logger, "URL validation", url=validator.hash_sensitive_data(url)):
@@ -221,20 +403,29 @@ class EnhancedVideoFrameExtractor:
                 video_logger.warning(f"URL validation failed: {str(e)}", url=validator.hash_sensitive_data(url))
                 return False, 'unknown', str(e)
     
-    def download_video(self, url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    def download_video(self, url: str, section: Optional[Tuple[float, float]] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
         Download video and return path, title, and any error
         
+        When section is given as (start, end) seconds, only that span is
+        fetched and the returned file starts at start.
+        
+        Raises:
+            SectionOutOfRangeError: section starts past the end of the video
+        
         Returns:
             (file_path, title, error_message)
         """
         start_time = datetime.now()
+        url_hash = validator.hash_sensitive_data(url)
+        platform = 'unknown'
         
-        with LogContext(video_logger, "Video download", url=validator.hash_sensitive_data(url)):
+        with LogContext(video_logger, "Video download", url=url_hash):
             try:
-                # Validate URL first
-                is_valid, platform, error = self.validate_and_process_url(url)
+                # Validate URL first; the detected platform is reused by the error handlers
+                is_valid, platform, error = validator.validate_url(url)
                 if not is_valid:
+                    video_logger.warning(f"URL validation failed: {error}", url=url_hash)
                     return None, None, error
                 
                 processor = self.processors.get(platform)
@@ -243,16 +434,24 @@ class EnhancedVideoFrameExtractor:
                     video_logger.error(error, platform=platform)
                     return None, None, error
                 
+                remote_section = section if self.can_download_sections else None
+                
                 # Special handling for Instagram
                 if platform == 'instagram':
-                    return self._download_instagram_video(url, processor)
+                    result = self._download_instagram_video(url, processor, remote_section)
+                else:
+                    # Standard download process
+                    result = self._download_standard_video(url, processor, remote_section)
                 
-                # Standard download process
-                return self._download_standard_video(url, processor)
+                if section and not remote_section and result[0]:
+                    result = self._trim_to_section(result, section)
+                return result
+            
+            except SectionOutOfRangeError:
+                raise
                 
             except yt_dlp.utils.DownloadError as e:
                 error_msg = str(e)
-                platform = self.get_platform_from_url(url)
                 processor = self.processors.get(platform)
                 
                 if processor:
@@ -270,42 +469,89 @@ class EnhancedVideoFrameExtractor:
             except Exception as e:
                 error_msg = f"Unexpected error during download: {str(e)}"
                 video_logger.exception("Video download failed", 
-                                     url=validator.hash_sensitive_data(url), 
+                                     url=url_hash, 
                                      error=str(e))
                 return None, None, error_msg
     
-    def _download_standard_video(self, url: str, processor: PlatformProcessor) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    def download_many(self, urls: List[str], max_workers: int = 4) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """
+        Download several videos concurrently
+        
+        Each download builds its own YoutubeDL and filename, so they share no
+        yt-dlp state; the workers mostly wait on network I/O.
+        
+        Returns:
+            download_video's (file_path, title, error_message) for each URL, in order
+        """
+        if not urls:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+            # Each task runs in a copy of this context so its log lines keep the request context
+            futures = [pool.submit(contextvars.copy_context().run, self.download_video, url) for url in urls]
+            return [future.result() for future in futures]
+    
+    def _apply_section(self, opts: MutableMapping[str, Any], section: Optional[Tuple[float, float]]) -> MutableMapping[str, Any]:
+        """Limit a yt-dlp download to (start, end) seconds"""
+        if section:
+            # ffmpeg input-seeks the remote media and stops at the end of the span
+            opts['download_ranges'] = yt_dlp.utils.download_range_func(None, [section])
+            opts['force_keyframes_at_cuts'] = True
+        return opts
+    
+    def _trim_to_section(self, result: Tuple[Optional[str], Optional[str], Optional[str]],
+                         section: Tuple[float, float]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Cut a fully downloaded file down to section when yt-dlp could not fetch just the span"""
+        file_path, title, _ = result
+        start, end = section
+        
+        source_duration = self.probe_duration(file_path)
+        if source_duration is not None and start >= source_duration:
+            os.remove(file_path)
+            raise SectionOutOfRangeError(
+                f"Start time ({start}s) exceeds video duration ({source_duration:.1f}s)"
+            )
+        
+        section_path = f"{os.path.splitext(file_path)[0]}_section.mp4"
+        success, error = self.extract_subclip(file_path, start, end - start, section_path)
+        os.remove(file_path)
+        if not success:
+            return None, None, error
+        return section_path, title, None
+    
+    def _download_standard_video(self, url: str, processor: PlatformProcessor,
+                                 section: Optional[Tuple[float, float]] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """Download video using standard process"""
-        opts = processor.get_download_options(url)
+        opts = self._apply_section(processor.get_download_options(url), section)
         
         with yt_dlp.YoutubeDL(opts) as ydl:
             # Extract info
             info = ydl.extract_info(url, download=False)
-            if not isinstance(info, dict) or not info:
+            if not info:
                 return None, None, "Could not extract video information"
             
-            title = validator.sanitize_filename(info.get('title', 'unknown'))
-            unique_id = str(uuid.uuid4())[:8]
-            filename = f"{title}_{unique_id}.%(ext)s"
-            opts['outtmpl'] = {'default': f'{self.config.DOWNLOAD_FOLDER}/{filename}'}
+            source_duration = info.get('duration')
+            if section and source_duration and section[0] >= source_duration:
+                raise SectionOutOfRangeError(
+                    f"Start time ({section[0]}s) exceeds video duration ({source_duration:.1f}s)"
+                )
             
-            # Download
-            ydl.download([url])
+            title = _set_unique_outtmpl(opts, info, self.config.DOWNLOAD_FOLDER)
             
-            # Find downloaded file
-            for file in os.listdir(self.config.DOWNLOAD_FOLDER):
-                if unique_id in file:
-                    file_path = os.path.join(self.config.DOWNLOAD_FOLDER, file)
-                    video_logger.log_video_processing(
-                        processor.platform, url, 'download', 'success'
-                    )
-                    return file_path, title, None
+            # Download
+            file_path = _download_file(ydl, url)
+            if file_path:
+                video_logger.log_video_processing(
+                    processor.platform, url, 'download', 'success'
+                )
+                return file_path, title, None
             
             return None, None, "Downloaded file not found"
     
-    def _download_instagram_video(self, url: str, processor: InstagramProcessor) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    def _download_instagram_video(self, url: str, processor: InstagramProcessor,
+                                  section: Optional[Tuple[float, float]] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """Download Instagram video with cookie fallback"""
-        base_opts = processor.get_download_options(url)
+        base_opts = self._apply_section(processor.get_download_options(url), section)
         
         try:
             file_path, title = processor.try_with_cookies(url, base_opts)
@@ -318,9 +564,8 @@ class EnhancedVideoFrameExtractor:
             return None, None, enhanced_error
     
     def get_platform_from_url(self, url: str) -> str:
-        """Get platform from URL"""
-        _, platform, _ = validator.validate_url(url)
-        return platform
+        """Get platform from URL (host lookup only; full validation is validate_url's job)"""
+        return validator.get_platform_from_url(url)
     
     def extract_frame_at_timestamp(self, video_path: str, timestamp: int, output_path: str) -> Tuple[bool, Optional[str]]:
         """
@@ -329,49 +574,257 @@ class EnhancedVideoFrameExtractor:
         Returns:
             (success, error_message)
         """
+        return self.extract_frames_at_timestamps(video_path, [(timestamp, output_path)])[0]
+    
+    def extract_frames_at_timestamps(self, video_path: str,
+                                     frames: List[Tuple[int, str]]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Extract several frames from one video in a single forward pass
+        
+        frames is a list of (timestamp, output_path). The capture is opened
+        once and timestamps are visited in ascending order: short gaps are
+        stepped with grab() (no seek, no decoder flush), longer ones are seeked.
+        
+        Returns:
+            (success, error_message) per frame, in the order given
+        """
         with LogContext(video_logger, "Frame extraction", 
                        video_path=os.path.basename(video_path), 
-                       timestamp=timestamp):
+                       frame_count=len(frames)):
             try:
                 # Validate inputs
                 is_valid_path, path_error = validator.validate_file_path(video_path, ['.mp4', '.avi', '.mov', '.mkv'])
                 if not is_valid_path:
-                    return False, path_error
+                    return [(False, path_error)] * len(frames)
                 
                 if not os.path.exists(video_path):
-                    return False, f"Video file not found: {video_path}"
+                    return [(False, f"Video file not found: {video_path}")] * len(frames)
                 
-                # Use OpenCV for frame extraction (more reliable than moviepy for single frames)
-                cap = cv2.VideoCapture(video_path)
-                if not cap.isOpened():
-                    return False, f"Could not open video file: {video_path}"
-                
-                # Set video position to timestamp (in milliseconds)
-                cap.set(cv2.CAP_PROP_POS_MSEC, timestamp * 1000)
-                
-                # Read frame
-                ret, frame = cap.read()
-                cap.release()
-                
-                if not ret:
-                    return False, f"Could not extract frame at timestamp {timestamp}s"
+                results = [None] * len(frames)
+                pending = range(len(frames))
+                if self.config.USE_FFMPEG_FRAME:
+                    for index, (timestamp, output_path) in enumerate(frames):
+                        if self._extract_frame_ffmpeg(video_path, timestamp, output_path):
+                            results[index] = (True, None)
+                    # OpenCV handles whatever ffmpeg could not
+                    pending = [index for index, result in enumerate(results) if result is None]
+                    if not pending:
+                        return results
                 
-                # Save frame
-                success = cv2.imwrite(output_path, frame)
-                if not success:
-                    return False, f"Could not save frame to {output_path}"
-                
-                video_logger.info("Frame extracted successfully", 
-                                timestamp=timestamp, 
-                                output_path=os.path.basename(output_path))
-                return True, None
+                # Use OpenCV for frame extraction (more reliable than moviepy for single frames);
+                # naming the FFmpeg backend skips probing the other capture backends first
+                cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+                if not cap.isOpened():
+                    return [result or (False, f"Could not open video file: {video_path}") for result in results]
                 
             except Exception as e:
-                video_logger.exception("Frame extraction failed", 
-                                     timestamp=timestamp, 
-                                     error=str(e))
-                return False, f"Frame extraction error: {str(e)}"
+                video_logger.exception("Frame extraction failed", error=str(e))
+                return [(False, f"Frame extraction error: {str(e)}")] * len(frames)
+            
+            try:
+                for index in sorted(pending, key=lambda i: frames[i][0]):
+                    timestamp, output_path = frames[index]
+                    try:
+                        results[index] = self._extract_next_frame(cap, timestamp, output_path)
+                    except Exception as e:
+                        video_logger.exception("Frame extraction failed", 
+                                             timestamp=timestamp, 
+                                             error=str(e))
+                        results[index] = (False, f"Frame extraction error: {str(e)}")
+            finally:
+                cap.release()
+            
+            return results
+    
+    def _extract_frame_ffmpeg(self, video_path: str, timestamp: int, output_path: str) -> bool:
+        """Write one frame with ffmpeg; True when the output file was produced"""
+        # -ss before -i seeks the input to the nearest keyframe instead of decoding from the start
+        cmd = [
+            get_moviepy_setting('FFMPEG_BINARY'), '-y', '-v', 'error',
+            '-ss', str(timestamp),
+            '-i', video_path,
+            '-frames:v', '1', '-q:v', '3', '-f', 'image2',
+            output_path
+        ]
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        
+        # ffmpeg exits 0 without writing anything when the timestamp is past the end
+        if result.returncode != 0 or not os.path.exists(output_path):
+            return False
+        video_logger.info("Frame extracted successfully", 
+                        timestamp=timestamp, 
+                        output_path=os.path.basename(output_path))
+        return True
+    
+    def _extract_next_frame(self, cap: cv2.VideoCapture, timestamp: int, output_path: str) -> Tuple[bool, Optional[str]]:
+        """Move cap forward to timestamp, then read and save that frame"""
+        target_ms = timestamp * 1000
+        # Position of the frame decoded last (0 before the first read)
+        current_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+        
+        if 0 < target_ms - current_ms <= FRAME_GRAB_FORWARD_MAX_MS:
+            # Decode forward without converting frames until the target is reached
+            ret = True
+            while ret and cap.get(cv2.CAP_PROP_POS_MSEC) < target_ms - 0.5:
+                ret = cap.grab()
+            ret, frame = cap.retrieve() if ret else (False, None)
+        else:
+            # Set video position to timestamp (in milliseconds)
+            cap.set(cv2.CAP_PROP_POS_MSEC, target_ms)
+            ret, frame = cap.read()
+        
+        if not ret:
+            return False, f"Could not extract frame at timestamp {timestamp}s"
+        
+        # Save frame: encode in memory, then one plain file write
+        ext = os.path.splitext(output_path)[1].lower() or '.jpg'
+        params = self._jpeg_params if ext in ('.jpg', '.jpeg') else []
+        success, buffer = cv2.imencode(ext, frame, params)
+        if not success:
+            return False, f"Could not save frame to {output_path}"
+        with open(output_path, 'wb') as f:
+            f.write(buffer)
+        
+        video_logger.info("Frame extracted successfully", 
+                        timestamp=timestamp, 
+                        output_path=os.path.basename(output_path))
+        return True, None
+    
+    def extract_frames(self, video_path: str, frames: List[Tuple[int, str]],
+                       max_workers: int = 4) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Extract several frames concurrently
+        
+        frames is a list of (timestamp, output_path). The timestamps are split
+        into contiguous runs, one per worker; each worker opens its own capture
+        (VideoCapture is not shareable across threads) and walks its run in one
+        forward pass. OpenCV releases the GIL while it decodes and encodes.
+        
+        Returns:
+            (success, error_message) per frame, in the order given
+        """
+        if not frames:
+            return []
+        
+        order = sorted(range(len(frames)), key=lambda i: frames[i][0])
+        workers = min(max_workers, len(frames))
+        runs = [order[i * len(order) // workers:(i + 1) * len(order) // workers] for i in range(workers)]
+        
+        results = [None] * len(frames)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                (run, pool.submit(contextvars.copy_context().run, self.extract_frames_at_timestamps,
+                                  video_path, [frames[i] for i in run]))
+                for run in runs
+            ]
+            for run, future in futures:
+                for index, result in zip(run, future.result()):
+                    results[index] = result
+        return results
+    
+    def probe_duration(self, video_path: str) -> Optional[float]:
+        """Get video duration in seconds without opening a decoder"""
+        try:
+            mtime_ns = os.stat(video_path).st_mtime_ns
+            return _probe_duration(video_path, mtime_ns)
+        except Exception as e:
+            video_logger.warning(f"Duration probe failed: {str(e)}",
+                                 video_path=os.path.basename(video_path))
+            return None
+    
+    def open_clip(self, video_path: str) -> VideoFileClip:
+        """
+        Get a shared VideoFileClip for a downloaded file
+        
+        Callers take .subclip() views of it and must not close it; readers are
+        closed on eviction, on cleanup of the file, and at exit.
+        """
+        video_path = os.path.abspath(video_path)
+        return _get_clip(video_path, os.stat(video_path).st_mtime_ns)
     
+    def extract_subclip(self, video_path: str, start_time: float, duration: float,
+                        output_path: str) -> Tuple[bool, Optional[str]]:
+        """
+        Cut a clip by stream copy with ffmpeg (no decode or re-encode)
+        
+        Input seeking (-ss before -i) snaps to the nearest keyframe, so the
+        cut may start slightly before start_time.
+        
+        Returns:
+            (success, error_message)
+        """
+        cmd = [
+            get_moviepy_setting('FFMPEG_BINARY'), '-y', '-v', 'error',
+            '-ss', f'{start_time:.3f}',
+            '-i', video_path,
+            '-t', f'{duration:.3f}',
+            '-map', '0:v', '-map', '0:a?',
+            '-c', 'copy',
+            '-avoid_negative_ts', '1',
+            output_path
+        ]
+        
+        with LogContext(video_logger, "Subclip stream copy",
+                       video_path=os.path.basename(video_path),
+                       start_time=start_time, duration=duration):
+            try:
+                result = subprocess.run(
+                    cmd, capture_output=True, text=True,
+                    timeout=self.config.FRAME_EXTRACTION_TIMEOUT
+                )
+            except (OSError, subprocess.TimeoutExpired) as e:
+                return False, f"ffmpeg failed: {str(e)}"
+            
+            if result.returncode != 0:
+                return False, f"ffmpeg failed: {result.stderr.strip()[-500:]}"
+            
+            return True, None
+
+    def render_vertical_subclip(self, video_path: str, start_time: float, duration: float,
+                                output_path: str, bitrate: str = '2000k') -> Tuple[bool, Optional[str]]:
+        """
+        Cut, center-crop to 9:16 and scale to 1080x1920 in one ffmpeg pass
+
+        The crop and scale run as a single filter graph inside ffmpeg, so each
+        frame is decoded, filtered and encoded once without a round trip
+        through Python.
+
+        Returns:
+            (success, error_message)
+        """
+        cmd = [
+            get_moviepy_setting('FFMPEG_BINARY'), '-y', '-v', 'error',
+            '-ss', f'{start_time:.3f}',
+            '-i', video_path,
+            '-t', f'{duration:.3f}',
+            '-map', '0:v', '-map', '0:a?',
+            '-vf', "crop=w='min(iw,ih*9/16)':h=ih,scale=1080:1920:flags=lanczos,setsar=1",
+            '-c:v', 'libx264', '-preset', 'veryfast', '-b:v', bitrate,
+            '-threads', '0', '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac',
+            '-movflags', '+faststart',
+            output_path
+        ]
+
+        with LogContext(video_logger, "Vertical subclip render",
+                       video_path=os.path.basename(video_path),
+                       start_time=start_time, duration=duration):
+            try:
+                result = subprocess.run(
+                    cmd, capture_output=True, text=True,
+                    timeout=self.config.FRAME_EXTRACTION_TIMEOUT
+                )
+            except (OSError, subprocess.TimeoutExpired) as e:
+                return False, f"ffmpeg failed: {str(e)}"
+
+            if result.returncode != 0:
+                return False, f"ffmpeg failed: {result.stderr.strip()[-500:]}"
+
+            return True, None
+
     def get_video_info(self, url: str) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
         """
         Get video information without downloading
@@ -390,31 +843,38 @@ class EnhancedVideoFrameExtractor:
                 if not processor:
                     return False, None, f"No processor available for platform: {platform}"
                 
-                opts = processor.get_download_options(url)
-                opts['quiet'] = True
+                cache_key = (platform, url)
+                with self._info_cache_lock:
+                    cached_info = self._info_cache.get(cache_key)
+                if cached_info is not None:
+                    return True, dict(cached_info), None
                 
-                with yt_dlp.YoutubeDL(opts) as ydl:
-                    info = ydl.extract_info(url, download=False)
-                    
-                    if not isinstance(info, dict) or not info:
-                        return False, None, "Could not extract video information"
-                    
-                    # Extract relevant information
-                    video_info = {
-                        'title': info.get('title', 'Unknown'),
-                        'duration': info.get('duration'),
-                        'view_count': info.get('view_count'),
-                        'uploader': info.get('uploader'),
-                        'upload_date': info.get('upload_date'),
-                        'description': info.get('description', '')[:500],  # Truncate long descriptions
-                        'thumbnail': info.get('thumbnail'),
-                        'platform': platform
-                    }
-                    
-                    video_logger.info("Video info extracted successfully", 
-                                    platform=platform, 
-                                    title=video_info['title'])
-                    return True, video_info, None
+                ydl = self._get_info_ydl(platform, processor, url)
+                info = ydl.extract_info(url, download=False)
+                
+                if not info:
+                    return False, None, "Could not extract video information"
+                
+                # Extract relevant information
+                video_info = {
+                    'title': info.get('title', 'Unknown'),
+                    'duration': info.get('duration'),
+                    'view_count': info.get('view_count'),
+                    'uploader': info.get('uploader'),
+                    'upload_date': info.get('upload_date'),
+                    'description': info.get('description', '')[:500],  # Truncate long descriptions
+                    'thumbnail': info.get('thumbnail'),
+                    'platform': platform
+                }
+                
+                video_logger.info("Video info extracted successfully", 
+                                platform=platform, 
+                                title=video_info['title'])
+                
+                # Only successes are cached, so a transient failure is retried next call
+                with self._info_cache_lock:
+                    self._info_cache[cache_key] = video_info
+                return True, dict(video_info), None
                     
             except yt_dlp.utils.DownloadError as e:
                 error_msg = str(e)
@@ -444,7 +904,7 @@ class EnhancedVideoFrameExtractor:
             space_freed = 0
             errors = []
             
-            cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+            cutoff_timestamp = (datetime.now() - timedelta(hours=max_age_hours)).timestamp()
             
             # Clean download and frame folders
             folders_to_clean = [
@@ -453,32 +913,30 @@ class EnhancedVideoFrameExtractor:
                 self.config.SHORTS_FOLDER
             ]
             
-            for folder in folders_to_clean:
-                try:
-                    if not folder.exists():
-                        continue
-                        
-                    for file_path in folder.iterdir():
-                        if file_path.is_file():
-                            file_stat = file_path.stat()
-                            file_time = datetime.fromtimestamp(file_stat.st_mtime)
-                            
-                            if file_time < cutoff_time:
-                                try:
-                                    file_size = file_stat.st_size
-                                    file_path.unlink()
-                                    files_deleted += 1
-                                    space_freed += file_size
-                                    video_logger.debug(f"Deleted old file: {file_path.name}")
-                                except Exception as e:
-                                    error_msg = f"Could not delete {file_path.name}: {str(e)}"
-                                    errors.append(error_msg)
-                                    video_logger.warning(error_msg)
-                                    
-                except Exception as e:
-                    error_msg = f"Could not clean folder {folder}: {str(e)}"
-                    errors.append(error_msg)
-                    video_logger.warning(error_msg)
+            # Scan the folders in parallel, then delete the old files across a pool
+            old_files = []
+            with ThreadPoolExecutor(max_workers=len(folders_to_clean)) as scan_pool:
+                scans = [
+                    (folder, scan_pool.submit(_scan_old_files, folder, cutoff_timestamp))
+                    for folder in folders_to_clean if folder.exists()
+                ]
+                for folder, scan in scans:
+                    try:
+                        old_files.extend(scan.result())
+                    except Exception as e:
+                        error_msg = f"Could not clean folder {folder}: {str(e)}"
+                        errors.append(error_msg)
+                        video_logger.warning(error_msg)
+            
+            with ThreadPoolExecutor(max_workers=CLEANUP_DELETE_WORKERS) as delete_pool:
+                results = delete_pool.map(lambda old_file: _delete_old_file(*old_file[:2]), old_files)
+                for (_, _, file_size), error_msg in zip(old_files, results):
+                    if error_msg:
+                        errors.append(error_msg)
+                        video_logger.warning(error_msg)
+                    else:
+                        files_deleted += 1
+                        space_freed += file_size
             
             space_freed_mb = space_freed / (1024 * 1024)  # Convert to MB
             video_logger.info("Cleanup completed", 
@@ -487,5 +945,7 @@ class EnhancedVideoFrameExtractor:
             
             return files_deleted, int(space_freed_mb), errors
 
-# Global extractor instance
-extractor = EnhancedVideoFrameExtractor()
+@lru_cache(maxsize=1)
+def get_extractor() -> EnhancedVideoFrameExtractor:
+    """Shared extractor instance, created on first use instead of at import"""
+    return EnhancedVideoFrameExtractor()
@@ -2,22 +2,48 @@
 YouTube Video Upload Module
 Handles uploading short videos directly to YouTube channel using YouTube Data API v3
 """
+import contextvars
+import hashlib
+import json
+import mmap
 import os
 import pickle
-from typing import Dict, Any, Optional, Tuple
-from googleapiclient.discovery import build
+import random
+import re
+import subprocess
+import threading
+import time
+import httplib2
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from fractions import Fraction
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
-from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
 
+# The discovery, OAuth and google-auth client modules are imported where they are
+# used, so importing this module (e.g. by the web app at startup) stays cheap
+if TYPE_CHECKING:
+    import google_auth_httplib2
+    from google.oauth2.credentials import Credentials
+
+from config import get_config
 from logger import app_logger
 
+# The hashtag that marks an upload as a Short, in any casing
+_SHORTS_HASHTAG_RE = re.compile(r'#shorts\b', re.IGNORECASE)
+
 class YouTubeUploaderError(Exception):
     """Custom exception for YouTube upload errors"""
     pass
 
+def _truncate_utf8(text: str, max_bytes: int) -> str:
+    """Cut text to at most max_bytes of UTF-8 without splitting a character"""
+    encoded = text.encode('utf-8')
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode('utf-8', errors='ignore')
+
 class YouTubeUploader:
     """
     Handles YouTube video uploads with OAuth2 authentication
@@ -27,21 +53,65 @@ class YouTubeUploader:
     YOUTUBE_UPLOAD_SCOPE = ["https://www.googleapis.com/auth/youtube.upload"]
     YOUTUBE_API_SERVICE_NAME = "youtube"
     YOUTUBE_API_VERSION = "v3"
+    # Resource parts sent with every insert (the keys of _build_body's result)
+    INSERT_PARTS = "snippet,status"
     
     # YouTube Shorts requirements
     SHORTS_MAX_DURATION = 60  # seconds
     SHORTS_ASPECT_RATIOS = [(9, 16), (1, 1)]  # Vertical or square
+    SHORTS_MAX_FILE_SIZE = 2 * 1024 * 1024 * 1024  # 2GB, well under YouTube's 256GB limit
+    
+    # Shorts up to this size are uploaded from a read-only memory map of the file
+    SHORTS_MMAP_MAX_SIZE = 200 * 1024 * 1024
+    
+    # YouTube caps the combined length of all tags (not their count)
+    TAGS_MAX_TOTAL_LENGTH = 500
+    
+    # Resumable upload retry policy; transport errors resume from the last
+    # byte the server committed instead of restarting the file
+    RETRIABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+    RETRIABLE_EXCEPTIONS = (httplib2.HttpLib2Error, ConnectionError, TimeoutError)
+    MAX_UPLOAD_RETRIES = 5
+    MAX_RETRY_BACKOFF_SECONDS = 60
+    # Log upload progress at most once per this many bytes
+    PROGRESS_LOG_INTERVAL = 25 * 1024 * 1024
+    
+    # Resumable upload chunks must be a multiple of 256 KiB. Small chunks cap
+    # throughput at one round trip per chunk; large ones cost that much memory
+    # and are resent whole when a chunk fails
+    UPLOAD_CHUNK_GRANULARITY = 256 * 1024
+    DEFAULT_UPLOAD_CHUNK_SIZE = 50 * 1024 * 1024
     
-    def __init__(self, client_secrets_file: str = "client_secrets.json"):
+    # Refresh access tokens this close to expiry; fresher ones are reused as is
+    TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+    
+    # (credentials, service) per client secrets file, shared by every uploader in
+    # the process so the pickle load and the discovery build happen once
+    _service_cache: Dict[str, Tuple['Credentials', Any]] = {}
+    _service_cache_lock = threading.Lock()
+    
+    # Authorized HTTP client per thread (httplib2.Http is not thread-safe), shared
+    # by every uploader so its kept-alive connections carry over between uploads
+    _thread_http = threading.local()
+    
+    def __init__(self, client_secrets_file: str = "client_secrets.json",
+                 chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE):
         """
         Initialize YouTube uploader
         
         Args:
             client_secrets_file: Path to OAuth2 client secrets JSON file
+            chunk_size: Default upload chunk size in bytes (rounded down to 256 KiB)
         """
         self.client_secrets_file = client_secrets_file
-        self.credentials_file = "youtube_credentials.pickle"
+        self.chunk_size = self._valid_chunk_size(chunk_size)
+        self.credentials_file = "youtube_credentials.json"
+        # Pickled credentials from earlier versions, converted on first load
+        self.legacy_credentials_file = "youtube_credentials.pickle"
+        # Saved resumable sessions, one manifest per upload fingerprint
+        self.upload_sessions_dir = str(get_config().UPLOAD_SESSIONS_FOLDER)
         self.youtube_service = None
+        self.credentials = None
         
     def authenticate(self, redirect_uri: str = "http://localhost:8080/oauth2callback") -> Tuple[bool, str]:
         """
@@ -53,30 +123,37 @@ class YouTubeUploader:
         Returns:
             Tuple of (success, auth_url_or_error_message)
         """
+        from google.auth.transport.requests import Request
+        from google_auth_oauthlib.flow import Flow
+        
         try:
-            credentials = self._load_credentials()
+            with self._service_cache_lock:
+                cached = self._service_cache.get(self.client_secrets_file)
+            credentials, service = cached if cached else (self._load_credentials(), None)
             
-            if not credentials or not credentials.valid:
-                if credentials and credentials.expired and credentials.refresh_token:
-                    # Refresh expired credentials
-                    credentials.refresh(Request())
+            if credentials and credentials.refresh_token and (
+                    not credentials.token or self._expires_soon(credentials)):
+                # Refresh expired or nearly expired credentials
+                previous_token = credentials.token
+                credentials.refresh(Request())
+                if credentials.token != previous_token:
                     self._save_credentials(credentials)
-                else:
-                    # Start OAuth2 flow
-                    flow = Flow.from_client_secrets_file(
-                        self.client_secrets_file,
-                        scopes=self.YOUTUBE_UPLOAD_SCOPE,
-                        redirect_uri=redirect_uri
-                    )
-                    
-                    auth_url, _ = flow.authorization_url(prompt='consent')
-                    return False, auth_url
+            elif not credentials or not credentials.valid:
+                # Start OAuth2 flow
+                flow = Flow.from_client_secrets_file(
+                    self.client_secrets_file,
+                    scopes=self.YOUTUBE_UPLOAD_SCOPE,
+                    redirect_uri=redirect_uri
+                )
+                
+                auth_url, _ = flow.authorization_url(prompt='consent')
+                return False, auth_url
             
-            self.youtube_service = build(
-                self.YOUTUBE_API_SERVICE_NAME,
-                self.YOUTUBE_API_VERSION,
-                credentials=credentials
-            )
+            # The service holds the credentials object, so a refresh above needs no rebuild
+            if service is None:
+                service = self._cache_service(credentials)
+            self.youtube_service = service
+            self.credentials = credentials
             
             return True, "Authentication successful"
             
@@ -95,6 +172,8 @@ class YouTubeUploader:
         Returns:
             Tuple of (success, message)
         """
+        from google_auth_oauthlib.flow import Flow
+        
         try:
             flow = Flow.from_client_secrets_file(
                 self.client_secrets_file,
@@ -106,12 +185,8 @@ class YouTubeUploader:
             credentials = flow.credentials
             
             self._save_credentials(credentials)
-            
-            self.youtube_service = build(
-                self.YOUTUBE_API_SERVICE_NAME,
-                self.YOUTUBE_API_VERSION,
-                credentials=credentials
-            )
+            self.youtube_service = self._cache_service(credentials)
+            self.credentials = credentials
             
             return True, "Authentication completed successfully"
             
@@ -127,7 +202,10 @@ class YouTubeUploader:
         tags: list = None,
         category_id: str = "22",  # People & Blogs
         privacy_status: str = "private",
-        is_short: bool = True
+        is_short: bool = True,
+        stat_result: Optional[os.stat_result] = None,
+        chunk_size: Optional[int] = None,
+        progress_cb: Optional[Callable[[int, int], None]] = None
     ) -> Tuple[bool, str, Optional[str]]:
         """
         Upload video to YouTube
@@ -140,66 +218,62 @@ class YouTubeUploader:
             category_id: YouTube category ID
             privacy_status: Video privacy (private, public, unlisted)
             is_short: Whether this is a YouTube Short
+            stat_result: A caller's os.stat of video_path; skips statting it again
+            chunk_size: Upload chunk size in bytes; defaults to self.chunk_size
+            progress_cb: Called with (bytes_uploaded, total_bytes) after each chunk
             
         Returns:
             Tuple of (success, message, video_id)
         """
+        from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
+        
         if not self.youtube_service:
             success, message = self.authenticate()
             if not success:
                 return False, f"Authentication required: {message}", None
         
-        if not os.path.exists(video_path):
-            return False, f"Video file not found: {video_path}", None
+        # One stat serves the existence check and the resume fingerprint
+        if stat_result is None:
+            try:
+                stat_result = os.stat(video_path)
+            except FileNotFoundError:
+                return False, f"Video file not found: {video_path}", None
         
+        mapped = None
         try:
-            # Prepare video metadata
-            if is_short:
-                # Add #Shorts hashtag for YouTube Shorts
-                if not description:
-                    description = "Created with VideoExtract - AI-powered short video generator"
-                if "#Shorts" not in description:
-                    description = f"{description}\n\n#Shorts #VideoExtract #AIGenerated"
-                
-                # Add default tags for shorts
-                if not tags:
-                    tags = ["Shorts", "VideoExtract", "AI", "viral", "trending"]
-            
-            snippet = {
-                "title": title[:100],  # YouTube title limit
-                "description": description[:5000],  # YouTube description limit
-                "tags": tags[:500] if tags else [],  # YouTube tags limit
-                "categoryId": category_id
-            }
-            
-            # Set video status
-            status = {
-                "privacyStatus": privacy_status,
-                "selfDeclaredMadeForKids": False
-            }
-            
-            # Create video resource
-            body = {
-                "snippet": snippet,
-                "status": status
-            }
+            body = self._build_body(title, description, tags, category_id, privacy_status, is_short)
             
             # Create media upload
-            media = MediaFileUpload(
-                video_path,
-                chunksize=-1,
-                resumable=True,
-                mimetype="video/*"
-            )
+            chunksize = self._valid_chunk_size(chunk_size) if chunk_size else self.chunk_size
+            if is_short and stat_result.st_size <= self.SHORTS_MMAP_MAX_SIZE:
+                mapped = self._map_file(video_path)
+            if mapped is not None:
+                # Each chunk is still copied out of the mapping (mmap.read), but from the
+                # mapped pages rather than through a read(2) call on an open file
+                media = MediaIoBaseUpload(mapped, mimetype="video/*", chunksize=chunksize, resumable=True)
+            else:
+                media = MediaFileUpload(
+                    video_path,
+                    chunksize=chunksize,
+                    resumable=True,
+                    mimetype="video/*"
+                )
             
             # Execute upload
             insert_request = self.youtube_service.videos().insert(
-                part=",".join(body.keys()),
+                part=self.INSERT_PARTS,
                 body=body,
                 media_body=media
             )
+            if self.credentials is not None:
+                insert_request.http = self._authorized_http()
             
-            video_id = self._resumable_upload(insert_request)
+            # A saved manifest lets a restarted process continue this upload
+            fingerprint = self._upload_fingerprint(video_path, stat_result, body)
+            manifest_path = self._upload_manifest_path(fingerprint)
+            video_id = self._resume_existing(insert_request, manifest_path, fingerprint, media.size())
+            if not video_id:
+                video_id = self._resumable_upload(insert_request, manifest_path, fingerprint, progress_cb)
             
             if video_id:
                 video_url = f"https://www.youtube.com/watch?v={video_id}"
@@ -216,6 +290,100 @@ class YouTubeUploader:
             error_msg = f"Upload failed: {str(e)}"
             app_logger.error(error_msg)
             return False, error_msg, None
+        finally:
+            if mapped is not None:
+                mapped.close()
+    
+    def _map_file(self, video_path: str) -> Optional[mmap.mmap]:
+        """Read-only memory map of video_path, or None where it cannot be mapped (e.g. some network filesystems)"""
+        try:
+            with open(video_path, 'rb') as f:
+                # The mapping stays valid after the file object is closed
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            app_logger.debug(f"Uploading {video_path} without mmap: {e}")
+            return None
+    
+    def _build_body(self, title: str, description: str, tags: Optional[list], category_id: str,
+                    privacy_status: str, is_short: bool) -> Dict[str, Any]:
+        """Video resource (snippet and status) for an insert request, trimmed to YouTube's limits"""
+        if is_short:
+            # Add #Shorts hashtag for YouTube Shorts
+            if not description:
+                description = "Created with VideoExtract - AI-powered short video generator"
+            if not _SHORTS_HASHTAG_RE.search(description):
+                description = f"{description}\n\n#Shorts #VideoExtract #AIGenerated"
+            
+            # Add default tags for shorts
+            if not tags:
+                tags = ["Shorts", "VideoExtract", "AI", "viral", "trending"]
+        
+        snippet = {
+            "title": title[:100],  # YouTube title limit (characters)
+            "description": _truncate_utf8(description, 5000),  # YouTube description limit (bytes)
+            "tags": self._normalize_tags(tags or []),
+            "categoryId": category_id
+        }
+        
+        # Set video status
+        status = {
+            "privacyStatus": privacy_status,
+            "selfDeclaredMadeForKids": False
+        }
+        
+        return {
+            "snippet": snippet,
+            "status": status
+        }
+    
+    def _normalize_tags(self, tags: list) -> list:
+        """
+        Strip and de-duplicate tags (case-insensitively), keeping the leading ones
+        that fit TAGS_MAX_TOTAL_LENGTH
+        
+        YouTube counts a comma between tags and quotes around tags with spaces.
+        """
+        kept = []
+        seen = set()
+        total = -1  # no comma before the first tag
+        for tag in tags:
+            tag = str(tag).strip()
+            key = tag.lower()
+            if not tag or key in seen:
+                continue
+            
+            length = len(tag) + 1 + (2 if ' ' in tag else 0)
+            if total + length > self.TAGS_MAX_TOTAL_LENGTH:
+                break
+            seen.add(key)
+            kept.append(tag)
+            total += length
+        return kept
+    
+    def upload_videos_batch(self, jobs: List[Dict[str, Any]], concurrency: int = 3) -> List[Tuple[bool, str, Optional[str]]]:
+        """
+        Upload several videos concurrently
+        
+        Each job is a dict of upload_video keyword arguments. Uploads spend their
+        time waiting on the network, so a few run at once; keep concurrency low,
+        since YouTube rate-limits parallel sessions per channel.
+        
+        Returns:
+            upload_video's (success, message, video_id) for each job, in order
+        """
+        if not jobs:
+            return []
+        
+        # Authenticate once here rather than racing to do it in every worker
+        if not self.youtube_service:
+            success, message = self.authenticate()
+            if not success:
+                return [(False, f"Authentication required: {message}", None)] * len(jobs)
+        
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(jobs))) as pool:
+            # Each task runs in a copy of this context so its log lines keep the request context
+            futures = [pool.submit(contextvars.copy_context().run, self.upload_video, **job) for job in jobs]
+            return [future.result() for future in futures]
     
     def get_upload_quota_info(self) -> Dict[str, Any]:
         """
@@ -234,113 +402,325 @@ class YouTubeUploader:
             "quota_reset": "Daily at midnight PST"
         }
     
-    def validate_short_video(self, video_path: str) -> Tuple[bool, str]:
+    def validate_short_video(self, video_path: str, size_hint: Optional[int] = None) -> Tuple[bool, str]:
         """
         Validate if video meets YouTube Shorts requirements
         
         Args:
             video_path: Path to video file
+            size_hint: File size from a caller's os.stat, to avoid statting again
             
         Returns:
             Tuple of (is_valid, message)
         """
         try:
-            import cv2
+            # File size check first: a stat rejects oversize files before any demuxing
+            # (YouTube limit is 256 GB, but we'll be more conservative)
+            file_size = size_hint if size_hint is not None else os.path.getsize(video_path)
+            if file_size > self.SHORTS_MAX_FILE_SIZE:
+                return False, f"File too large: {file_size / (1024*1024):.1f}MB (max 2GB)"
             
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
+            try:
+                properties = self._probe_video(video_path)
+            except FileNotFoundError:
+                # No ffprobe on PATH: open the file with OpenCV instead
+                properties = self._probe_video_cv2(video_path)
+            if properties is None:
                 return False, "Cannot open video file"
-            
-            # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            duration = frame_count / fps if fps > 0 else 0
-            
-            cap.release()
+            width, height, duration = properties
             
             # Check duration (YouTube Shorts must be ≤ 60 seconds)
             if duration > self.SHORTS_MAX_DURATION:
                 return False, f"Video too long: {duration:.1f}s (max {self.SHORTS_MAX_DURATION}s)"
             
             # Check aspect ratio (should be vertical or square)
-            aspect_ratio = width / height if height > 0 else 0
             is_vertical = height > width  # 9:16 or similar
-            is_square = abs(aspect_ratio - 1.0) < 0.1  # Close to 1:1
+            is_square = abs(width - height) * 10 < height  # Within 10% of 1:1, in integers
             
             if not (is_vertical or is_square):
+                aspect_ratio = width / height if height > 0 else 0
                 return False, f"Invalid aspect ratio: {aspect_ratio:.2f} (should be vertical or square)"
             
-            # File size check (YouTube limit is 256 GB, but we'll be more conservative)
-            file_size = os.path.getsize(video_path)
-            max_size = 2 * 1024 * 1024 * 1024  # 2GB limit
-            if file_size > max_size:
-                return False, f"File too large: {file_size / (1024*1024):.1f}MB (max 2GB)"
-            
             return True, f"Valid YouTube Short: {duration:.1f}s, {width}x{height}"
             
         except Exception as e:
             return False, f"Validation error: {str(e)}"
     
-    def _load_credentials(self) -> Optional[Credentials]:
+    def _probe_video(self, video_path: str) -> Optional[Tuple[int, int, float]]:
+        """
+        Read (width, height, duration) of the first video stream with ffprobe
+        
+        Only the container headers are parsed. Raises FileNotFoundError when
+        ffprobe is not installed; returns None when the file has no video stream.
+        """
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+             '-show_entries', 'stream=width,height,r_frame_rate,nb_frames,duration:format=duration',
+             '-of', 'json', video_path],
+            capture_output=True, text=True, timeout=30
+        )
+        info = json.loads(result.stdout or '{}')
+        streams = info.get('streams')
+        if not streams:
+            return None
+        
+        stream = streams[0]
+        # Not every container records a per-stream duration (e.g. WebM/MKV)
+        duration = stream.get('duration') or info.get('format', {}).get('duration')
+        if duration is None and stream.get('nb_frames'):
+            fps = Fraction(stream.get('r_frame_rate', '0/1'))
+            duration = int(stream['nb_frames']) / fps if fps else 0
+        return int(stream.get('width', 0)), int(stream.get('height', 0)), float(duration or 0)
+    
+    def _probe_video_cv2(self, video_path: str) -> Optional[Tuple[int, int, float]]:
+        """(width, height, duration) via OpenCV, for hosts without ffprobe"""
+        import cv2
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            return None
+        
+        # Get video properties
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        duration = frame_count / fps if fps > 0 else 0
+        
+        cap.release()
+        return width, height, duration
+    
+    def _authorized_http(self, credentials: Optional['Credentials'] = None) -> 'google_auth_httplib2.AuthorizedHttp':
+        """This thread's authorized HTTP client for credentials (default: the current ones)"""
+        import google_auth_httplib2
+        from googleapiclient.http import build_http
+        
+        credentials = credentials or self.credentials
+        http = getattr(self._thread_http, 'client', None)
+        # A token refresh updates the credentials in place, so only new credentials need a new client
+        if http is None or http.credentials is not credentials:
+            http = self._thread_http.client = google_auth_httplib2.AuthorizedHttp(
+                credentials, http=build_http())
+        return http
+    
+    def _cache_service(self, credentials: 'Credentials') -> Any:
+        """Build the API service for credentials and share it with other uploaders"""
+        from googleapiclient.discovery import build
+        
+        # Use the discovery document bundled with googleapiclient: no fetch, no cache lookup
+        service = build(
+            self.YOUTUBE_API_SERVICE_NAME,
+            self.YOUTUBE_API_VERSION,
+            http=self._authorized_http(credentials),
+            cache_discovery=False,
+            static_discovery=True
+        )
+        with self._service_cache_lock:
+            self._service_cache[self.client_secrets_file] = (credentials, service)
+        return service
+    
+    def _expires_soon(self, credentials: 'Credentials') -> bool:
+        """Whether credentials expire within TOKEN_REFRESH_MARGIN (never, without an expiry)"""
+        if credentials.expiry is None:
+            return False
+        # google-auth stores expiry as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return credentials.expiry - now < self.TOKEN_REFRESH_MARGIN
+    
+    @classmethod
+    def _valid_chunk_size(cls, chunk_size: int) -> int:
+        """Round chunk_size down to a multiple of 256 KiB (at least one unit)"""
+        return max(cls.UPLOAD_CHUNK_GRANULARITY, chunk_size - chunk_size % cls.UPLOAD_CHUNK_GRANULARITY)
+    
+    def _load_credentials(self) -> Optional['Credentials']:
         """Load saved credentials from file"""
+        from google.oauth2.credentials import Credentials
+        
         if os.path.exists(self.credentials_file):
             try:
-                with open(self.credentials_file, 'rb') as f:
-                    return pickle.load(f)
+                with open(self.credentials_file, 'r', encoding='utf-8') as f:
+                    return Credentials.from_authorized_user_info(json.load(f), self.YOUTUBE_UPLOAD_SCOPE)
+            except Exception as e:
+                app_logger.warning(f"Failed to load credentials: {e}")
+        elif os.path.exists(self.legacy_credentials_file):
+            try:
+                with open(self.legacy_credentials_file, 'rb') as f:
+                    credentials = pickle.load(f)
+                self._save_credentials(credentials)
+                app_logger.info(f"Migrated YouTube credentials to {self.credentials_file}")
+                return credentials
             except Exception as e:
                 app_logger.warning(f"Failed to load credentials: {e}")
         return None
     
-    def _save_credentials(self, credentials: Credentials) -> None:
+    def _save_credentials(self, credentials: 'Credentials') -> None:
         """Save credentials to file"""
         try:
-            with open(self.credentials_file, 'wb') as f:
-                pickle.dump(credentials, f)
+            with open(self.credentials_file, 'w', encoding='utf-8') as f:
+                f.write(credentials.to_json())
         except Exception as e:
             app_logger.error(f"Failed to save credentials: {e}")
     
-    def _resumable_upload(self, insert_request) -> Optional[str]:
+    def _resumable_upload(self, insert_request, manifest_path: Optional[str] = None,
+                          fingerprint: Optional[str] = None,
+                          progress_cb: Optional[Callable[[int, int], None]] = None) -> Optional[str]:
         """
         Execute resumable upload with retry logic
         
         Args:
             insert_request: YouTube API insert request
+            manifest_path: Where to record the session after each chunk, if anywhere
+            fingerprint: Identifies the file and metadata the session belongs to
+            progress_cb: Called with (bytes_uploaded, total_bytes) after each chunk
             
         Returns:
             Video ID if successful, None otherwise
         """
         response = None
         retry = 0
-        max_retries = 3
+        last_logged = 0
         
         while response is None:
+            error = None
+            retry_after = None
             try:
                 status, response = insert_request.next_chunk()
+                if response is None and manifest_path:
+                    self._save_upload_manifest(manifest_path, fingerprint, insert_request)
+                if status is not None:
+                    if progress_cb:
+                        progress_cb(status.resumable_progress, status.total_size)
+                    if status.resumable_progress - last_logged >= self.PROGRESS_LOG_INTERVAL:
+                        last_logged = status.resumable_progress
+                        app_logger.info(f"Uploaded {status.resumable_progress}/{status.total_size} bytes "
+                                        f"({status.progress():.0%})")
                 if response is not None:
                     if 'id' in response:
+                        self._remove_upload_manifest(manifest_path)
                         return response['id']
                     else:
                         app_logger.error(f"Upload failed: {response}")
                         return None
             except HttpError as e:
-                if e.resp.status in [500, 502, 503, 504]:
-                    # Retry on server errors
-                    retry += 1
-                    if retry > max_retries:
-                        app_logger.error(f"Max retries exceeded: {e}")
-                        return None
-                    
-                    import time
-                    time.sleep(2 ** retry)  # Exponential backoff
+                if e.resp.status in self.RETRIABLE_STATUS_CODES:
+                    error = e
+                    retry_after = e.resp.get('retry-after')
                 else:
                     raise
+            except self.RETRIABLE_EXCEPTIONS as e:
+                # next_chunk() asks the server for the committed offset and
+                # continues from there, so only the unacknowledged tail is resent
+                error = e
             except Exception as e:
                 app_logger.error(f"Unexpected error during upload: {e}")
                 return None
+            
+            if error is not None:
+                retry += 1
+                if retry > self.MAX_UPLOAD_RETRIES:
+                    app_logger.error(f"Max retries exceeded: {error}")
+                    return None
+                
+                time.sleep(self._retry_delay(retry, retry_after))
+        
+        return None
+    
+    def _upload_fingerprint(self, video_path: str, stat_result: os.stat_result, body: Dict[str, Any]) -> str:
+        """Hash of the file version and metadata; a saved session only resumes an identical upload"""
+        key = json.dumps([os.path.abspath(video_path), stat_result.st_size, stat_result.st_mtime_ns, body],
+                         sort_keys=True)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
+    def _upload_manifest_path(self, fingerprint: str) -> str:
+        """Manifest location; kept out of the video folders so session URIs are never served"""
+        return os.path.join(self.upload_sessions_dir, f"{fingerprint}.json")
+    
+    def _save_upload_manifest(self, manifest_path: str, fingerprint: Optional[str], insert_request) -> None:
+        """Record the session URI and committed offset (written atomically)"""
+        manifest = {
+            'uri': insert_request.resumable_uri,
+            'progress': insert_request.resumable_progress,
+            'fingerprint': fingerprint
+        }
+        try:
+            temp_path = f"{manifest_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(temp_path, manifest_path)
+        except OSError as e:
+            app_logger.warning(f"Could not save upload progress: {e}")
+    
+    def _remove_upload_manifest(self, manifest_path: Optional[str]) -> None:
+        if manifest_path:
+            try:
+                os.remove(manifest_path)
+            except FileNotFoundError:
+                pass
+    
+    def _resume_existing(self, insert_request, manifest_path: str, fingerprint: str, total_size: int) -> Optional[str]:
+        """
+        Point insert_request at the session saved in manifest_path, if it is still usable
         
+        Asks the server how many bytes it committed (PUT with Content-Range
+        bytes */total) and continues from there.
+        
+        Returns:
+            Video ID when the saved session had already finished, else None
+        """
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            app_logger.warning(f"Ignoring unreadable upload manifest: {e}")
+            self._remove_upload_manifest(manifest_path)
+            return None
+        
+        if manifest.get('fingerprint') != fingerprint or not manifest.get('uri'):
+            # The file or its metadata changed since; start a new session
+            self._remove_upload_manifest(manifest_path)
+            return None
+        
+        try:
+            resp, content = insert_request.http.request(
+                manifest['uri'], method='PUT',
+                headers={'Content-Length': '0', 'Content-Range': f'bytes */{total_size}'}
+            )
+        except self.RETRIABLE_EXCEPTIONS as e:
+            # The session cannot be queried; drop it so this and later attempts start fresh
+            app_logger.warning(f"Could not query saved upload session, starting a new one: {e}")
+            self._remove_upload_manifest(manifest_path)
+            return None
+        if resp.status == 308:
+            # Range is "bytes=0-<last committed byte>"; absent when nothing was committed
+            committed = resp.get('range')
+            insert_request.resumable_uri = manifest['uri']
+            insert_request.resumable_progress = int(committed.rsplit('-', 1)[1]) + 1 if committed else 0
+            app_logger.info(f"Resuming upload at byte {insert_request.resumable_progress} of {total_size}")
+            return None
+        
+        self._remove_upload_manifest(manifest_path)
+        if resp.status in (200, 201):
+            return json.loads(content).get('id')
+        # Expired or unknown session (e.g. 404/410): upload from the start
         return None
+    
+    def _retry_delay(self, retry: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before retry number retry
+        
+        Capped exponential backoff plus up to a second of jitter, so concurrent
+        uploads that failed together do not retry in lockstep. A longer
+        Retry-After (in seconds) from the server wins.
+        """
+        delay = min(2 ** retry, self.MAX_RETRY_BACKOFF_SECONDS) + random.uniform(0, 1)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        app_logger.warning(f"Upload interrupted, retry {retry}/{self.MAX_UPLOAD_RETRIES} in {delay:.1f}s")
+        return delay
 
-# Global uploader instance
-youtube_uploader = YouTubeUploader()
+@lru_cache(maxsize=None)
+def get_uploader(client_secrets_file: str = "client_secrets.json") -> YouTubeUploader:
+    """Shared uploader for client_secrets_file, created on first use instead of at import"""
+    return YouTubeUploader(client_secrets_file)